@@ -3,6 +3,16 @@ import { getServerSession } from 'next-auth'
 import { authOptions } from '@/lib/auth'
 import { query } from '@/lib/db'
 
+// Catalog-wide IMDb aggregates precomputed by the importer (catalog_stats row 'catalog')
+interface CatalogStats {
+  episodes: number
+  movies: number
+  episodeRuntime: number
+  movieRuntime: number
+  seriesBands: { title: string, start: number, end: number }[]
+  movieOrders: number[]
+}
+
 // Filters: scope: all|series|movies|show:<uuid>
 // timeRange: all|week|month|year (based on created/updated timestamps)
 // users: current|all|<uuid>[] (if array of user ids)
@@ -67,6 +77,11 @@ export async function POST(req: Request) {
     showIds = rows.map(r => r.id)
   }
 
+  // Precomputed catalog totals/bands; missing table or row (e.g. after a streaming import) -> live queries
+  const catalogStats = await query<{ stats: CatalogStats }>(`SELECT stats FROM catalog_stats WHERE scope = 'catalog'`)
+    .then(r => r.rows[0]?.stats ?? null)
+    .catch(() => null)
+
   // Average rating (per selected users and scope)
   const ratingsClauses: string[] = []
   const ratingsParams: any[] = []
@@ -95,14 +110,22 @@ export async function POST(req: Request) {
 
   // Episodes in scope
   if (includeShows) {
-    const epScopeFilter = showIds.length ? 'WHERE s.show_id = ANY($1::uuid[])' : ''
-    const epTotal = await query<{ total_runtime: number, total_count: string }>(
-      `SELECT COALESCE(SUM(e.runtime),0)::int AS total_runtime, COUNT(e.id)::text AS total_count
-       FROM episodes e JOIN seasons s ON s.id = e.season_id ${epScopeFilter}`,
-      showIds.length ? [showIds] : []
-    )
-    totalRuntime += epTotal.rows[0]?.total_runtime || 0
-    const epTotalCount = parseInt(epTotal.rows[0]?.total_count || '0', 10)
+    let epTotalRuntime = 0
+    let epTotalCount = 0
+    if (catalogStats && (scope === 'all' || scope === 'series')) {
+      epTotalRuntime = catalogStats.episodeRuntime
+      epTotalCount = catalogStats.episodes
+    } else {
+      const epScopeFilter = showIds.length ? 'WHERE s.show_id = ANY($1::uuid[])' : ''
+      const epTotal = await query<{ total_runtime: number, total_count: string }>(
+        `SELECT COALESCE(SUM(e.runtime),0)::int AS total_runtime, COUNT(e.id)::text AS total_count
+         FROM episodes e JOIN seasons s ON s.id = e.season_id ${epScopeFilter}`,
+        showIds.length ? [showIds] : []
+      )
+      epTotalRuntime = epTotal.rows[0]?.total_runtime || 0
+      epTotalCount = parseInt(epTotal.rows[0]?.total_count || '0', 10)
+    }
+    totalRuntime += epTotalRuntime
     totalCount += epTotalCount
     totalEpisodes += epTotalCount
 
@@ -126,12 +149,18 @@ export async function POST(req: Request) {
 
   // Movies in scope
   if (includeMovies) {
-    const mvScopeFilter = '' // all movies or limited later by ids if needed
-    const mvTotal = await query<{ total_runtime: number, total_count: string }>(
-      `SELECT COALESCE(SUM(runtime),0)::int AS total_runtime, COUNT(id)::text AS total_count FROM movies ${mvScopeFilter}`
-    )
-    totalRuntime += mvTotal.rows[0]?.total_runtime || 0
-    const mvCnt = parseInt(mvTotal.rows[0]?.total_count || '0', 10)
+    let mvCnt = 0
+    if (catalogStats) {
+      totalRuntime += catalogStats.movieRuntime
+      mvCnt = catalogStats.movies
+    } else {
+      const mvScopeFilter = '' // all movies or limited later by ids if needed
+      const mvTotal = await query<{ total_runtime: number, total_count: string }>(
+        `SELECT COALESCE(SUM(runtime),0)::int AS total_runtime, COUNT(id)::text AS total_count FROM movies ${mvScopeFilter}`
+      )
+      totalRuntime += mvTotal.rows[0]?.total_runtime || 0
+      mvCnt = parseInt(mvTotal.rows[0]?.total_count || '0', 10)
+    }
     totalCount += mvCnt
     totalMovies += mvCnt
 
@@ -258,7 +287,9 @@ export async function POST(req: Request) {
 
   // Series bands (episode ranges per show) for background shading
   let seriesBands: { title: string, start: number, end: number }[] = []
-  if (includeShows) {
+  if (includeShows && catalogStats) {
+    seriesBands = catalogStats.seriesBands
+  } else if (includeShows) {
     const bandsRes = await query<{ title: string, start: number, finish: number }>(
       `WITH ords AS (
          SELECT sh.title,
@@ -277,7 +308,9 @@ export async function POST(req: Request) {
 
   // Movie order positions to mark on charts
   let movieOrders: number[] = []
-  if (includeMovies) {
+  if (includeMovies && catalogStats) {
+    movieOrders = catalogStats.movieOrders
+  } else if (includeMovies) {
     const mvRes = await query<{ ord: number }>(
       `SELECT (COALESCE(m."order", 0) * 10000) AS ord FROM movies m WHERE m."order" IS NOT NULL ORDER BY ord`
     )
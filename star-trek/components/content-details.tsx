@@ -2,6 +2,7 @@ import { Badge } from "@/components/ui/badge"
 import { Progress } from "@/components/ui/progress"
 import { Calendar, Clock, Star } from "lucide-react"
 import Image from "next/image"
+import { thumbnailUrl } from "@/lib/images"
 
 interface ContentDetailsProps {
   content: any // This would be properly typed in a real application
@@ -96,13 +97,15 @@ export function ContentDetails({ content }: ContentDetailsProps) {
           {content.imagePath ? (
             <div className="w-full max-w-[200px] aspect-[2/3] rounded-lg overflow-hidden border-2 border-orange-500">
               <Image
-                src={content.imagePath || "/placeholder.svg"}
+                src={thumbnailUrl(content.imagePath, "detail") || "/placeholder.svg"}
                 alt={content.title}
                 width={200}
                 height={300}
                 className="w-full h-full object-cover"
                 onError={(e) => {
-                  e.currentTarget.src = `/placeholder.svg?height=300&width=200`
+                  // Fallback to the full-size image (no thumbnail), then to placeholder
+                  const img = e.currentTarget
+                  img.src = content.imagePath && !img.src.endsWith(content.imagePath) ? content.imagePath : `/placeholder.svg?height=300&width=200`
                 }}
               />
             </div>
@@ -3,6 +3,7 @@
 import { useState, useEffect } from "react"
 import Link from "next/link"
 import Image from "next/image"
+import { thumbnailUrl } from "@/lib/images"
 import { Checkbox } from "@/components/ui/checkbox"
 import {
   AlertDialog,
@@ -305,14 +306,15 @@ export function ContentList({
                 {item.imagePath && (item.type === 'show' || item.type === 'movie') && (
                   <div className="relative h-36 w-24 overflow-hidden rounded-md border border-orange-500 bg-black">
                     <Image
-                      src={item.imagePath || "/placeholder.svg"}
+                      src={thumbnailUrl(item.imagePath, "list") || "/placeholder.svg"}
                       alt={item.title}
                       fill
                       sizes="(max-width: 768px) 96px, 144px"
                       className="object-contain"
-                      // Fallback to placeholder if image fails to load
+                      // Fallback to the full-size image (no thumbnail), then to placeholder
                       onError={(e) => {
-                        e.currentTarget.src = `/placeholder.svg`
+                        const img = e.currentTarget
+                        img.src = item.imagePath && !img.src.endsWith(item.imagePath) ? item.imagePath : `/placeholder.svg`
                       }}
                     />
                   </div>
@@ -0,0 +1,18 @@
+// Artwork imported into the content-addressed store (public/images/store) can have pre-sized
+// thumbnails next to it, written by scripts/imdb_fetch.py when Pillow is installed:
+// <hash>.<variant>.<format>. The formats that were written are listed in the path's
+// ?thumbs= query (e.g. "/images/store/<hash>.jpg?thumbs=webp,avif"); without it there are none.
+const STORE_IMAGE = /^(\/images\/store\/[0-9a-f]{64})\.[a-z0-9]+(?:\?thumbs=([a-z0-9,]*))?$/i
+
+// Smallest first. A browser that cannot decode AVIF gets the full image through onError.
+const THUMBNAIL_FORMATS = ["avif", "webp"]
+
+export type ThumbnailVariant = "list" | "detail"
+
+export function thumbnailUrl(src: string | undefined, variant: ThumbnailVariant): string | undefined {
+  if (!src) return src
+  const match = STORE_IMAGE.exec(src)
+  const available = match?.[2]?.split(",") ?? []
+  const format = THUMBNAIL_FORMATS.find((f) => available.includes(f))
+  return match && format ? `${match[1]}.${variant}.${format}` : src
+}
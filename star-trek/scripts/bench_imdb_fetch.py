@@ -0,0 +1,296 @@
+"""
+Offline benchmark for the IMDb importer in imdb_fetch.py.
+
+Replays title objects through a stand-in for cinemagoerng's `web` module, with injectable
+latency and error rates, so changes to the fetch path (concurrency, caching, ...) can be
+compared on a machine with no network. Fixtures come from either:
+
+  * a response cache directory written by a real import (`--fixtures scripts/data/cache`):
+    recorded cinemagoerng title objects, needs cinemagoerng installed to unpickle; or
+  * the committed scripts/data/*.json output (default): synthetic title objects with the same
+    shape, where episode runtimes are only on the episode detail pages, as on IMDb.
+
+Usage: python scripts/bench_imdb_fetch.py [--scenario show|movie|import|all] [--latency MS] ...
+"""
+import os
+import sys
+import json
+import time
+import pickle
+import random
+import resource
+import tempfile
+import argparse
+import threading
+import tracemalloc
+from concurrent.futures import Future, ThreadPoolExecutor
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import imdb_fetch  # cinemagoerng is imported lazily and never here: ReplayWeb takes the place of `web`
+
+
+class InjectedError(ConnectionError):
+    """Simulated upstream failure."""
+
+
+class ReplayWeb:
+    """
+    Stand-in for `cinemagoerng.web`: serves fixtures keyed by (imdb_id, page, season) after a
+    simulated network delay, failing a configurable fraction of calls. Missing episodes pages
+    come back empty (the end-of-series signal); other missing pages raise LookupError.
+    """
+    def __init__(self, fixtures, latency=0.0, jitter=0.0, error_rate=0.0, seed=0):
+        self.fixtures = fixtures
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def get_title(self, imdb_id, page="main", season=None, **kwargs):
+        with self._lock:
+            delay = max(0.0, self.latency + self._random.uniform(-self.jitter, self.jitter))
+            fail = self._random.random() < self.error_rate
+        if delay:
+            time.sleep(delay)
+        if fail:
+            raise InjectedError(f"injected failure for {imdb_id} page={page} season={season}")
+        key = (imdb_id, page, str(season) if season is not None else None)
+        if key in self.fixtures:
+            return self.fixtures[key]
+        if page == "episodes":
+            return SimpleNamespace(episodes={})
+        raise LookupError(f"no fixture for {imdb_id} page={page} season={season}")
+
+
+def load_recorded_fixtures(cache_dir):
+    """Read a response cache directory (<imdb_id>/<page>[_s<season>].pickle) into a fixture map."""
+    fixtures = {}
+    for imdb_id in sorted(os.listdir(cache_dir)):
+        title_dir = os.path.join(cache_dir, imdb_id)
+        if not os.path.isdir(title_dir):
+            continue
+        for filename in os.listdir(title_dir):
+            if not filename.endswith('.pickle'):
+                continue
+            name = filename[:-len('.pickle')]
+            page, _, season = name.partition('_s')
+            with open(os.path.join(title_dir, filename), 'rb') as f:
+                fixtures[(imdb_id, page, season or None)] = pickle.load(f)['value']
+    return fixtures
+
+
+def synthetic_fixtures(data_dir):
+    """Build title objects shaped like CinemagoerNG's from the committed JSON import output."""
+    with open(os.path.join(data_dir, 'tv_series_data.json')) as f:
+        tv_data = json.load(f)
+    with open(os.path.join(data_dir, 'movies_data.json')) as f:
+        movie_data = json.load(f)
+    fixtures = {}
+    for series_index, series in enumerate(tv_data):
+        show = series.get('show') or {}
+        imdb_id = show.get('imdbId') or next(
+            (i['imdb_id'] for i in imdb_fetch.TV_SERIES.values() if i['order'] == show.get('order')), None)
+        if not imdb_id:
+            continue
+        meta = SimpleNamespace(title=show.get('title'), plot=show.get('description'), rating=show.get('imdbRating'),
+                               primary_image=None, seasons=[str(s['number']) for s in series.get('seasons') or []])
+        fixtures[(imdb_id, 'reference', None)] = meta
+        fixtures[(imdb_id, 'main', None)] = meta
+        for season in series.get('seasons') or []:
+            episodes = {}
+            for index, ep in enumerate(season.get('episodes') or []):
+                ep_id = f"tt9{series_index:02}{season['number']:02}{index:03}"
+                episodes[str(index)] = SimpleNamespace(
+                    title=ep.get('title'), release_date=ep.get('airDate'), primary_image=None,
+                    rating=ep.get('imdbRating'), plot=ep.get('description'), episode=ep.get('episodeNumber'),
+                    imdb_id=ep_id)
+                fixtures[(ep_id, 'main', None)] = SimpleNamespace(runtime=ep.get('runtime'))
+            fixtures[(imdb_id, 'episodes', str(season['number']))] = SimpleNamespace(
+                episodes={str(season['number']): episodes})
+    for movie in movie_data:
+        imdb_id = movie.get('imdbId') or next(
+            (i['imdb_id'] for i in imdb_fetch.MOVIES.values() if i['order'] == movie.get('order')), None)
+        if not imdb_id:
+            continue
+        year = int(movie['releaseDate'][:4]) if movie.get('releaseDate') else None
+        fixtures[(imdb_id, 'reference', None)] = SimpleNamespace(
+            title=movie.get('title'), plot=movie.get('description'), year=year, primary_image=None,
+            rating=movie.get('imdbRating'), runtime=movie.get('runtime'))
+    return fixtures
+
+
+def offline_artwork(url, prefix):
+    """
+    Stand-in for ImageDownloader.submit: nothing is downloaded and the source URL is kept, as
+    after a failed download. Recorded fixtures carry real primary_image URLs.
+    """
+    future = Future()
+    future.set_result(url)
+    return future
+
+
+def count_episodes(series_results):
+    return sum(len(s.get('episodes') or []) for r in series_results if r for s in r.get('seasons') or [])
+
+
+def run_shows(workers):
+    """fetch_show_and_episodes for every series, `workers` titles at a time."""
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(lambda item: imdb_fetch.import_series(*item), imdb_fetch.TV_SERIES.items()))
+    return sum(1 for r in results if r and r.get('show')), count_episodes(results)
+
+
+def run_movies(workers):
+    """fetch_movie for every movie, `workers` titles at a time."""
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(lambda item: imdb_fetch.import_movie(*item), imdb_fetch.MOVIES.items()))
+    return sum(1 for r in results if r), 0
+
+
+def run_import(workers):
+    """The whole import_star_trek_data run, including writing the JSON output (to a temp dir)."""
+    try:
+        imdb_fetch.import_star_trek_data(workers=workers)
+    except imdb_fetch.ImportIncompleteError as e:
+        # Titles kept failing after their retries: nothing was written, so there is nothing to count
+        print(f"import incomplete: {e}", file=sys.stderr)
+        return 0, 0
+    with open(os.path.join(imdb_fetch.DATA_DIR, 'tv_series_data.json')) as f:
+        tv_data = json.load(f)
+    with open(os.path.join(imdb_fetch.DATA_DIR, 'movies_data.json')) as f:
+        movie_data = json.load(f)
+    return len(tv_data) + len(movie_data), count_episodes(tv_data)
+
+
+def run_stream(workers):
+    """The whole run with `import --ndjson`: records streamed to a temp file, no JSON output."""
+    path = os.path.join(imdb_fetch.DATA_DIR, 'catalog.ndjson')
+    try:
+        with open(path, 'w') as stream:
+            imdb_fetch.import_star_trek_data(workers=workers, ndjson_stream=stream)
+    except imdb_fetch.ImportIncompleteError as e:
+        print(f"import incomplete: {e}", file=sys.stderr)
+    titles, episodes = set(), 0
+    with open(path) as f:
+        for line in f:
+            record = json.loads(line)
+            if record['type'] in ('show', 'movie'):
+                titles.add(record.get('imdbId') or record['title'])  # shows are written twice
+            episodes += record['type'] == 'episode'
+    return len(titles), episodes
+
+
+SCENARIOS = {
+    'show': run_shows,
+    'movie': run_movies,
+    'import': run_import,
+    'stream': run_stream,
+}
+
+
+def run_scenario(name, workers, trace_memory):
+    """Run one scenario against the replay stand-in and return its measurements."""
+    imdb_fetch.metrics.reset()
+    imdb_fetch.page_memo.clear()
+    if trace_memory:
+        tracemalloc.start()
+    started = time.perf_counter()
+    titles, episodes = SCENARIOS[name](workers)
+    wall = time.perf_counter() - started
+    peak = None
+    if trace_memory:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    report = imdb_fetch.metrics.report()
+    latencies = sorted(v for values in imdb_fetch.metrics.latencies.values() for v in values)
+    return {
+        'scenario': name,
+        'wall_seconds': round(wall, 3),
+        'titles': titles,
+        'episodes': episodes,
+        'titles_per_second': round(titles / wall, 2) if wall else None,
+        'episodes_per_second': round(episodes / wall, 2) if wall else None,
+        'requests': len(latencies),
+        'request_errors': sum(r['errors'] for r in report['requests'].values()),
+        'latency_p50': imdb_fetch.percentile(latencies, 50),
+        'latency_p99': imdb_fetch.percentile(latencies, 99),
+        'episode_detail_fallbacks': report['episode_detail_fallbacks'],
+        'episode_runtime_bulk': report['episode_runtime_bulk'],
+        'retries': report['scheduler']['retries'],
+        'peak_traced_bytes': peak,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline benchmark for imdb_fetch.py")
+    parser.add_argument('--scenario', choices=sorted(SCENARIOS) + ['all'], default='all')
+    parser.add_argument('--fixtures', metavar='CACHE_DIR',
+                        help="replay recorded title objects from a response cache directory "
+                             "(default: synthetic fixtures from scripts/data/*.json)")
+    parser.add_argument('--latency', type=float, default=50.0, help="simulated per-request latency in ms (default 50)")
+    parser.add_argument('--jitter', type=float, default=0.0, help="uniform +/- latency jitter in ms")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="fraction of requests that fail (0-1)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=imdb_fetch.DEFAULT_WORKERS)
+    parser.add_argument('--fetch-workers', type=int, default=imdb_fetch.DEFAULT_FETCH_WORKERS)
+    parser.add_argument('--runtimes', metavar='PATH',
+                        help="title.basics dataset for bulk episode runtimes, as `import --runtimes`")
+    parser.add_argument('--rate', type=float, default=0.0,
+                        help="per-host minimum request interval in seconds (default 0: measure the fetch path only)")
+    parser.add_argument('--trace-memory', action='store_true',
+                        help="track peak Python allocations with tracemalloc (slows the run)")
+    parser.add_argument('--json', action='store_true', help="print results as JSON")
+    parser.add_argument('--log-level', default='WARNING', choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'])
+    args = parser.parse_args()
+
+    import logging
+    logging.basicConfig(level=args.log_level, format="%(message)s", stream=sys.stderr)
+
+    if args.fixtures:
+        fixtures = load_recorded_fixtures(args.fixtures)
+    else:
+        fixtures = synthetic_fixtures(imdb_fetch.DATA_DIR)
+    imdb_fetch.web = ReplayWeb(fixtures, latency=args.latency / 1000.0, jitter=args.jitter / 1000.0,
+                               error_rate=args.error_rate, seed=args.seed)
+
+    # Keep the run hermetic: no response cache, no artwork, no writes into scripts/data
+    imdb_fetch.response_cache.enabled = False
+    imdb_fetch.scheduler.min_interval = args.rate
+    imdb_fetch.fetch_pool(max(1, args.fetch_workers))
+    out_dir = tempfile.mkdtemp(prefix='imdb-bench-')
+    imdb_fetch.DATA_DIR = out_dir
+    imdb_fetch.CHECKPOINT_PATH = os.path.join(out_dir, 'import_checkpoint.ndjson')
+    imdb_fetch.SNAPSHOT_PATH = os.path.join(out_dir, 'catalog.snapshot')
+    imdb_fetch.PREVIOUS_SNAPSHOT_PATH = os.path.join(out_dir, 'catalog.prev.snapshot')
+    imdb_fetch.STATS_PATH = os.path.join(out_dir, 'catalog_stats.json')
+    imdb_fetch.runtime_index.source = args.runtimes
+    imdb_fetch.runtime_index.index_path = os.path.join(out_dir, 'title_runtimes.bin')
+    imdb_fetch.runtime_index.load()  # build outside the timed scenarios
+    imdb_fetch.image_downloader.submit = offline_artwork
+    imdb_fetch.image_downloader.store = imdb_fetch.ImageStore(
+        store_dir=os.path.join(out_dir, 'images'), manifest_path=os.path.join(out_dir, 'image_manifest.json'),
+        legacy_dir=os.path.join(out_dir, 'images'))
+
+    scenarios = sorted(SCENARIOS) if args.scenario == 'all' else [args.scenario]
+    results = [run_scenario(name, args.workers, args.trace_memory) for name in scenarios]
+    peak_rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    if args.json:
+        print(json.dumps({'fixtures': len(fixtures), 'peak_rss_kb': peak_rss_kb, 'results': results}, indent=2))
+        return
+    print(f"{len(fixtures)} fixtures, latency {args.latency}ms +/- {args.jitter}ms, error rate {args.error_rate}, "
+          f"workers {args.workers}/{args.fetch_workers}")
+    for r in results:
+        line = (f"{r['scenario']:>6}: {r['wall_seconds']:8.3f}s  {r['titles_per_second']:7.2f} titles/s  "
+                f"{r['episodes_per_second']:8.2f} episodes/s  {r['requests']:5d} requests "
+                f"({r['request_errors']} errors)  p50 {r['latency_p50']}s  p99 {r['latency_p99']}s")
+        if r['peak_traced_bytes'] is not None:
+            line += f"  peak {r['peak_traced_bytes'] / 1024 / 1024:.1f} MiB"
+        print(line)
+    print(f"peak RSS {peak_rss_kb / 1024:.1f} MiB")
+
+
+if __name__ == '__main__':
+    main()
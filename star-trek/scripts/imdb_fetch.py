@@ -1,31 +1,47 @@
 
 import re
 import os
+import io
 import json
-import urllib.request
-from urllib.parse import urlparse
+import math
+import logging
+import time
+import pickle
+import random
+import gzip
+import mmap
+import struct
+import hashlib
+import inspect
+import unicodedata
+import dataclasses
+import shutil
+import tempfile
+import queue
+import threading
+from array import array
+from bisect import bisect_left
+from collections import deque
+from contextlib import closing
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from urllib.parse import urljoin, urlparse
 from datetime import datetime
 from decimal import Decimal
 
-from cinemagoerng import web  # Using CinemagoerNG
+# CinemagoerNG's `web` module, imported by imdb_web() on the first IMDb fetch so that commands
+# which never fetch (search, index, load, stats, diff, ...) start without it
+web = None
 
-# Debugging control
-DEBUG = True
-def dbg(msg):
-    if DEBUG:
-        try:
-            print(msg)
-        except Exception:
-            try:
-                print(str(msg))
-            except Exception:
-                pass
+# Logging: level set with --log-level; DEBUG adds per-page and per-episode detail
+log = logging.getLogger("imdb_fetch")
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
 
 def dump_attrs(obj, label, show_values=False):
     try:
         names = sorted([n for n in dir(obj) if not n.startswith('_')])
-        print(f"[{label}] attrs=\n  " + "\n  ".join(names))
-        # Print runtime-like field values if present
+        log.debug(f"[{label}] attrs=\n  " + "\n  ".join(names))
+        # Log runtime-like field values if present
         keys = [k for k in names if any(x in k for x in ("runtime", "running_time", "duration", "length"))]
         vals = {}
         for k in keys:
@@ -34,9 +50,9 @@ def dump_attrs(obj, label, show_values=False):
             except Exception:
                 vals[k] = "<error>"
         if vals:
-            print(f"[{label}] runtime-like values={vals}")
+            log.debug(f"[{label}] runtime-like values={vals}")
         if show_values:
-            # Dangerous/noisy: print a shallow dict of simple fields
+            # Dangerous/noisy: log a shallow dict of simple fields
             shallow = {}
             for n in names:
                 try:
@@ -47,42 +63,1062 @@ def dump_attrs(obj, label, show_values=False):
                     pass
             if shallow:
                 try:
-                    print(f"[{label}] shallow={json.dumps(shallow)[:800]}")
+                    log.debug(f"[{label}] shallow={json.dumps(shallow)[:800]}")
                 except Exception:
-                    print(f"[{label}] shallow=<unserializable>")
+                    log.debug(f"[{label}] shallow=<unserializable>")
     except Exception as e:
-        print(f"[{label}] <failed to dump attrs>: {e}")
+        log.debug(f"[{label}] <failed to dump attrs>: {e}")
 
-def download_image(url, prefix):
+# Run instrumentation (written as a JSON report at the end of an import)
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)  # seconds, upper bounds
+DEFAULT_REPORT_PATH = os.path.join(DATA_DIR, 'import_report.json')
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list, rounded to 4 decimal places (None if empty)."""
+    if not sorted_values:
+        return None
+    n = len(sorted_values)
+    rank = min(n, max(1, math.ceil(pct * n / 100)))  # pct * n first keeps the division exact for whole ranks
+    return round(sorted_values[rank - 1], 4)
+
+class RunMetrics:
     """
-    Download an image from the given URL and save it to public/images with a filename based on the prefix.
-    Returns the relative path (e.g., "images/filename.jpg") or the original URL if download fails.
+    Thread-safe counters and timings for one import run: upstream page latency by page type,
+    episode-detail fallbacks, response cache outcomes, image transfers and per-title wall time.
     """
-    if not url:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.started_at = time.time()
+            self._started = time.monotonic()
+            self.latencies = {}   # page type -> [seconds]
+            self.errors = {}      # page type -> count
+            self.counters = {}
+            self.titles = []
+
+    def incr(self, name, amount=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def observe_request(self, page, seconds, ok=True):
+        with self._lock:
+            self.latencies.setdefault(page, []).append(seconds)
+            if not ok:
+                self.errors[page] = self.errors.get(page, 0) + 1
+
+    def record_title(self, kind, imdb_id, name, seconds, ok):
+        with self._lock:
+            self.titles.append({'kind': kind, 'imdbId': imdb_id, 'name': name,
+                                'seconds': round(seconds, 3), 'ok': ok})
+
+    def report(self):
+        with self._lock:
+            requests = {}
+            for page, values in sorted(self.latencies.items()):
+                values = sorted(values)
+                histogram = {}
+                for bound in LATENCY_BUCKETS:
+                    histogram[f"le_{bound}"] = sum(1 for v in values if v <= bound)
+                histogram["le_inf"] = len(values)
+                requests[page] = {
+                    'count': len(values),
+                    'errors': self.errors.get(page, 0),
+                    'total_seconds': round(sum(values), 3),
+                    'p50': percentile(values, 50),
+                    'p90': percentile(values, 90),
+                    'p99': percentile(values, 99),
+                    'max': round(values[-1], 4) if values else None,
+                    'histogram': histogram,
+                }
+            c = dict(self.counters)
+            lookups = c.get('cache.hit', 0) + c.get('cache.miss', 0)
+            return {
+                'started_at': datetime.fromtimestamp(self.started_at).isoformat(timespec='seconds'),
+                'wall_seconds': round(time.monotonic() - self._started, 3),
+                'requests': requests,
+                'episode_detail_fallbacks': c.get('episode_detail_fallbacks', 0),
+                'episode_runtime_bulk': c.get('episode_runtime_bulk', 0),
+                # summed over all worker threads, so it can exceed wall_seconds
+                'rate_limit_wait_seconds': round(c.get('rate_limit_wait_seconds', 0), 3),
+                'scheduler': {
+                    'retries': c.get('scheduler.retries', 0),
+                    'throttled': c.get('scheduler.throttled', 0),
+                    'circuit_trips': c.get('scheduler.circuit_trips', 0),
+                    'deduplicated': c.get('scheduler.deduplicated', 0),
+                },
+                'cache': {
+                    'hits': c.get('cache.hit', 0),
+                    'misses': c.get('cache.miss', 0),
+                    'stale_served': c.get('cache.stale', 0),
+                    'hit_rate': round(c.get('cache.hit', 0) / lookups, 4) if lookups else None,
+                    # pages asked for again within the run, served from the per-run memo
+                    'memo_hits': c.get('memo.hit', 0),
+                },
+                'images': {
+                    'downloaded': c.get('images.downloaded', 0),
+                    'failed': c.get('images.failed', 0),
+                    'reused': c.get('images.reused', 0),
+                    'bytes': c.get('images.bytes', 0),
+                    'seconds': round(c.get('images.seconds', 0), 3),
+                },
+                'titles': sorted(self.titles, key=lambda t: -t['seconds']),
+            }
+
+    def write_report(self, path=DEFAULT_REPORT_PATH):
+        report = self.report()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(report, f, indent=2)
+        return report
+
+metrics = RunMetrics()
+
+# Concurrency control
+DEFAULT_WORKERS = 4
+DEFAULT_REQUEST_INTERVAL = 0.5  # minimum seconds between requests to the same host
+IMDB_HOST = "www.imdb.com"
+
+# Request scheduling (see RequestScheduler)
+DEFAULT_BURST = 1           # requests a host may receive back to back before spacing kicks in
+MAX_INTERVAL_FACTOR = 16    # throttling can stretch the interval up to this multiple of the configured one
+REQUEST_RETRIES = 4
+REQUEST_BACKOFF = 1.0       # seconds, doubled after each retryable failure, with full jitter
+REQUEST_BACKOFF_MAX = 60.0
+THROTTLE_STATUS = (429, 503)
+CIRCUIT_WINDOW = 20         # most recent request outcomes per host considered by the breaker
+CIRCUIT_THRESHOLD = 0.5     # failure ratio over the window that opens the circuit
+CIRCUIT_COOLDOWN = 30.0     # seconds the host is paused for; doubled on each consecutive trip
+CIRCUIT_MAX_TRIPS = 4       # consecutive trips before giving up on the host
+CIRCUIT_GIVE_UP = CIRCUIT_COOLDOWN * 2 ** CIRCUIT_MAX_TRIPS  # seconds given-up hosts fail fast before a retry
+
+class CircuitOpenError(RuntimeError):
+    """
+    Raised while a host that kept failing after repeated pauses is given up on; the import stops
+    (use --resume later). A long-lived worker's calls fail fast until CIRCUIT_GIVE_UP has passed.
+    """
+
+def http_status(exc):
+    """HTTP status carried by an exception from web.get_title (urllib's HTTPError), if any."""
+    status = getattr(exc, 'code', None) or getattr(exc, 'status', None)
+    return status if isinstance(status, int) else None
+
+def is_retryable(exc):
+    """Throttling, server errors and network failures are worth retrying; 4xx and parse errors are not."""
+    if isinstance(exc, CircuitOpenError):
+        return False
+    status = http_status(exc)
+    if status is not None:
+        return status == 429 or status >= 500
+    import http.client
+    return isinstance(exc, (OSError, http.client.HTTPException))
+
+def retry_after(exc):
+    """Seconds from a Retry-After header on an HTTP error, if present and numeric."""
+    headers = getattr(exc, 'headers', None)
+    try:
+        return max(0.0, float(headers.get('Retry-After'))) if headers is not None else None
+    except (TypeError, ValueError):
         return None
+
+class RequestScheduler:
+    """
+    Central scheduler for upstream requests. Per host it keeps:
+
+    - a token bucket refilled every `min_interval` seconds, holding up to `burst` tokens. The
+      interval doubles whenever the host throttles us (429/503) and eases back towards the
+      configured value as requests succeed.
+    - a circuit breaker over the last CIRCUIT_WINDOW outcomes. Past CIRCUIT_THRESHOLD failures
+      every request to the host waits out a cooldown, pausing the whole import; after
+      CIRCUIT_MAX_TRIPS consecutive trips requests fail with CircuitOpenError for CIRCUIT_GIVE_UP
+      seconds. Then requests go out again (half-open): one more trip gives up again, a healthy
+      window closes the circuit.
+
+    `call` adds retries with exponential backoff and jitter, and runs identical requests that
+    are in flight at the same time only once. Safe to share between worker threads. `clock`
+    and `sleep` are injectable for tests.
+    """
+    def __init__(self, min_interval=0.0, burst=DEFAULT_BURST, retries=REQUEST_RETRIES,
+                 clock=time.monotonic, sleep=time.sleep):
+        self.min_interval = min_interval
+        self.burst = burst
+        self.retries = retries
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._hosts = {}
+        self._in_flight = {}
+        self._random = random.Random()
+
+    def _host(self, host):
+        state = self._hosts.get(host)
+        if state is None:
+            state = self._hosts[host] = {
+                'tokens': float(self.burst), 'updated': self._clock(), 'interval': self.min_interval,
+                'outcomes': deque(maxlen=CIRCUIT_WINDOW), 'open_until': 0.0, 'trips': 0,
+            }
+        return state
+
+    def wait(self, host, interval=None):
+        """
+        Block until a request to `host` may go out: circuit closed and a token available.
+        `interval` overrides the host's spacing (artwork hosts have their own rate).
+        """
+        while True:
+            with self._lock:
+                state = self._host(host)
+                now = self._clock()
+                if state['trips'] > CIRCUIT_MAX_TRIPS:
+                    if state['open_until'] > now:
+                        raise CircuitOpenError(f"{host} kept failing after {CIRCUIT_MAX_TRIPS} pauses")
+                    state['trips'] = CIRCUIT_MAX_TRIPS  # half-open
+                paused = state['open_until'] - now
+                if paused <= 0:
+                    if interval is None:
+                        interval = state['interval']
+                    if interval and interval > 0:
+                        state['tokens'] = min(float(self.burst), state['tokens'] + (now - state['updated']) / interval)
+                    else:
+                        state['tokens'] = float(self.burst)
+                    state['updated'] = now
+                    # Reserve a token even if it has not accrued yet; the deficit is our wait
+                    state['tokens'] -= 1
+                    delay = -state['tokens'] * interval if state['tokens'] < 0 else 0
+                    break
+            self._sleep(paused)
+        if delay > 0:
+            metrics.incr('rate_limit_wait_seconds', delay)
+            self._sleep(delay)
+
+    def record(self, host, ok, status=None):
+        """Feed one request outcome to the host's throttle and circuit breaker state."""
+        with self._lock:
+            state = self._host(host)
+            if status in THROTTLE_STATUS and self.min_interval:
+                state['interval'] = min(self.min_interval * MAX_INTERVAL_FACTOR, (state['interval'] or self.min_interval) * 2)
+                metrics.incr('scheduler.throttled')
+            elif ok and state['interval'] > self.min_interval:
+                state['interval'] = max(self.min_interval, state['interval'] * 0.9)
+            if state['open_until'] > self._clock():
+                return  # requests that were already in flight when the circuit opened
+            state['outcomes'].append(ok)
+            failures = state['outcomes'].count(False)
+            if len(state['outcomes']) == CIRCUIT_WINDOW and failures < CIRCUIT_WINDOW * CIRCUIT_THRESHOLD:
+                state['trips'] = 0
+            elif failures >= CIRCUIT_WINDOW * CIRCUIT_THRESHOLD:
+                seen = len(state['outcomes'])
+                state['trips'] += 1
+                state['outcomes'].clear()
+                metrics.incr('scheduler.circuit_trips')
+                if state['trips'] > CIRCUIT_MAX_TRIPS:
+                    state['open_until'] = self._clock() + CIRCUIT_GIVE_UP
+                    log.error(f"{host}: still failing after {CIRCUIT_MAX_TRIPS} pauses; "
+                              f"giving up for {CIRCUIT_GIVE_UP:.0f}s")
+                    return
+                cooldown = CIRCUIT_COOLDOWN * 2 ** (state['trips'] - 1)
+                state['open_until'] = self._clock() + cooldown
+                log.warning(f"{host}: {failures} of the last {seen} requests failed; "
+                            f"pausing requests for {cooldown:.0f}s (trip {state['trips']})")
+
+    def call(self, host, key, fn, label='request'):
+        """
+        Run `fn` (one request to `host`) under the scheduler and return its result. Concurrent
+        calls with the same `key` share a single request. `label` names the latency series.
+        """
+        with self._lock:
+            shared = self._in_flight.get(key)
+            if shared is None:
+                future = self._in_flight[key] = Future()
+        if shared is not None:
+            metrics.incr('scheduler.deduplicated')
+            return shared.result()
+        try:
+            future.set_result(self._attempt(host, fn, label))
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+        return future.result()
+
+    def _attempt(self, host, fn, label):
+        for attempt in range(self.retries + 1):
+            self.wait(host)
+            started = self._clock()
+            try:
+                value = fn()
+            except Exception as e:
+                metrics.observe_request(label, self._clock() - started, ok=False)
+                retryable = is_retryable(e)
+                self.record(host, ok=not retryable, status=http_status(e))
+                if not retryable or attempt == self.retries:
+                    raise
+                backoff = min(REQUEST_BACKOFF_MAX, REQUEST_BACKOFF * 2 ** attempt)
+                # A server's Retry-After is honoured up to REQUEST_BACKOFF_MAX like our own backoff
+                delay = min(retry_after(e) or self._random.uniform(0, backoff), REQUEST_BACKOFF_MAX)
+                metrics.incr('scheduler.retries')
+                log.debug(f"[REQUEST] {label} {host} attempt {attempt + 1} failed: {e}; retrying in {delay:.1f}s")
+                self._sleep(delay)
+                continue
+            metrics.observe_request(label, self._clock() - started)
+            self.record(host, ok=True)
+            return value
+
+scheduler = RequestScheduler(DEFAULT_REQUEST_INTERVAL)
+
+def should_fall_back(exc):
+    """
+    Whether a failed page fetch may be retried against another page of the same title. Not
+    when the scheduler already retried a throttled/transient failure: that would only add load.
+    """
+    return not is_retryable(exc) and not isinstance(exc, CircuitOpenError)
+
+# Season pages and episode detail lookups run on their own pool, separate from the
+# per-title pool, so a title waiting on its pages can never starve the pool it waits on.
+DEFAULT_FETCH_WORKERS = 8
+SEASON_PREFETCH = 3  # season pages requested ahead of the one being processed
+_fetch_pool = None
+_fetch_pool_lock = threading.Lock()
+
+def fetch_pool(workers=None):
+    """Return the shared page-fetch pool, creating it (with `workers` threads) on first use."""
+    global _fetch_pool
+    with _fetch_pool_lock:
+        if _fetch_pool is None:
+            _fetch_pool = ThreadPoolExecutor(max_workers=workers or DEFAULT_FETCH_WORKERS,
+                                             thread_name_prefix="imdb-fetch")
+        return _fetch_pool
+
+# Response cache: parsed title objects from web.get_title, stored under scripts/data/cache
+CACHE_DIR = os.path.join(DATA_DIR, 'cache')
+DAY = 24 * 60 * 60
+CACHE_TTLS = {
+    'ended': 90 * DAY,    # series that have finished airing
+    'airing': 1 * DAY,    # series still getting new seasons/episodes (see "airing" in TV_SERIES)
+    'movie': 30 * DAY,
+    'episode': 30 * DAY,  # individual episode detail pages
+    'default': 7 * DAY,
+}
+
+class CacheMiss(LookupError):
+    """Raised in cache-only mode when a page is not in the response cache."""
+
+class ResponseCache:
+    """
+    On-disk cache of web.get_title results keyed by (imdb_id, page, season).
+    Entries expire after the TTL of their content class; an expired entry is still
+    served if refetching it fails. `offline` serves from the cache only.
+    """
+    def __init__(self, cache_dir=CACHE_DIR, ttls=None, enabled=True, offline=False):
+        self.cache_dir = cache_dir
+        self.ttls = dict(CACHE_TTLS, **(ttls or {}))
+        self.enabled = enabled
+        self.offline = offline
+
+    def _path(self, imdb_id, page, season):
+        name = f"{page}_s{season}" if season is not None else page
+        return os.path.join(self.cache_dir, imdb_id, f"{name}.pickle")
+
+    def _load(self, imdb_id, page, season):
+        try:
+            with open(self._path(imdb_id, page, season), 'rb') as f:
+                return pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            # Corrupt entry or objects from an incompatible CinemagoerNG version
+            log.debug(f"[CACHE] unreadable entry {imdb_id}/{page}/{season}: {e}")
+            return None
+
+    def get(self, imdb_id, page, season=None, content_class='default', allow_stale=False):
+        """Return the cached value, or None if missing (or expired, unless allow_stale)."""
+        if not self.enabled:
+            return None
+        entry = self._load(imdb_id, page, season)
+        if entry is None:
+            return None
+        ttl = self.ttls.get(content_class, self.ttls['default'])
+        if not allow_stale and not self.offline and time.time() - entry['fetched_at'] > ttl:
+            return None
+        return entry['value']
+
+    def put(self, imdb_id, page, season, value):
+        if not self.enabled or value is None:
+            return
+        path = self._path(imdb_id, page, season)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump({'fetched_at': time.time(), 'value': value}, f)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            log.error(f"Error writing cache entry for {imdb_id}/{page}: {e}")
+
+    def invalidate(self, imdb_id):
+        """Drop every cached page for a title."""
+        shutil.rmtree(os.path.join(self.cache_dir, imdb_id), ignore_errors=True)
+
+response_cache = ResponseCache()
+
+def content_class_for(imdb_id):
+    """Cache TTL class for a configured title: 'airing', 'ended', 'movie' or 'default'."""
+    for info in TV_SERIES.values():
+        if info['imdb_id'] == imdb_id:
+            return 'airing' if info.get('airing') else 'ended'
+    for info in MOVIES.values():
+        if info['imdb_id'] == imdb_id:
+            return 'movie'
+    return 'default'
+
+class PageMemo:
+    """
+    Per-run memo in front of the response cache: each (imdb_id, page, season) is loaded at most
+    once per run. Concurrent callers share the first caller's result, and a failed page fails
+    the same way for later callers instead of being requested again. Values derived from a
+    page (see page_runtime) are kept alongside it.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pages = {}
+        self._derived = {}
+
+    def clear(self):
+        with self._lock:
+            self._pages = {}
+            self._derived = {}
+
+    def claim(self, key):
+        """Return (future, owner). The owner must resolve the future; everyone else waits on it."""
+        with self._lock:
+            future = self._pages.get(key)
+            if future is not None:
+                return future, False
+            future = self._pages[key] = Future()
+            return future, True
+
+    def derive(self, key, name, fn):
+        """Return fn() computed once per run for (`key`, `name`)."""
+        with self._lock:
+            if (key, name) in self._derived:
+                return self._derived[(key, name)]
+        value = fn()
+        with self._lock:
+            return self._derived.setdefault((key, name), value)
+
+    def release(self, imdb_ids):
+        """Drop the pages (and derived values) of these titles once nothing will ask for them again."""
+        imdb_ids = set(imdb_ids)
+        with self._lock:
+            self._pages = {k: v for k, v in self._pages.items() if k[0] not in imdb_ids}
+            self._derived = {k: v for k, v in self._derived.items() if k[0][0] not in imdb_ids}
+
+page_memo = PageMemo()
+
+def imdb_web():
+    """CinemagoerNG's `web` module, imported on first use (or whatever stand-in was assigned to `web`)."""
+    global web
+    if web is None:
+        from cinemagoerng import web as module
+        web = module
+    return web
+
+def get_title(imdb_id, content_class=None, **kwargs):
+    """
+    Memoized, cached wrapper around web.get_title, scheduled by `scheduler` (rate limit, retries,
+    circuit breaker). All IMDb page fetches go through here.
+    """
+    page = kwargs.get('page', 'main')
+    season = kwargs.get('season')
+    future, owner = page_memo.claim((imdb_id, page, season))
+    if not owner:
+        metrics.incr('memo.hit')
+        return future.result()
     try:
-        parsed_url = urlparse(url)
-        _, ext = os.path.splitext(parsed_url.path)
-        if not ext:
-            ext = ".jpg"
-        filename = f"{prefix}{ext}"
-        
-        # Adjust path for Next.js public directory
-        project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        images_folder = os.path.join(project_root, 'public', 'images')
-        
-        if not os.path.exists(images_folder):
-            os.makedirs(images_folder)
-        
-        file_path = os.path.join(images_folder, filename)
-        if os.path.exists(file_path):
-            return f"/images/{filename}"  # Return URL path for web access
-            
-        urllib.request.urlretrieve(url, file_path)
-        return f"/images/{filename}"  # Return URL path for web access
+        future.set_result(load_title(imdb_id, page, season, content_class, kwargs))
+    except BaseException as e:
+        future.set_exception(e)
+    return future.result()
+
+def load_title(imdb_id, page, season, content_class, kwargs):
+    """Load one page from the response cache, or upstream through the scheduler."""
+    content_class = content_class or content_class_for(imdb_id)
+    cached = response_cache.get(imdb_id, page, season, content_class)
+    if cached is not None:
+        log.debug(f"[CACHE] hit {imdb_id} page={page} season={season}")
+        metrics.incr('cache.hit')
+        return cached
+    if response_cache.enabled:
+        metrics.incr('cache.miss')
+    if response_cache.offline:
+        raise CacheMiss(f"{imdb_id} page={page} season={season} not cached")
+
+    try:
+        value = scheduler.call(IMDB_HOST, (imdb_id, page, season), lambda: imdb_web().get_title(imdb_id=imdb_id, **kwargs), page)
+    except CircuitOpenError:
+        raise
     except Exception as e:
-        print(f"Error downloading image from {url}: {e}")
-        return url
+        stale = response_cache.get(imdb_id, page, season, content_class, allow_stale=True)
+        if stale is None:
+            raise
+        log.warning(f"Error fetching {imdb_id} page={page} season={season}: {e}. Using stale cache entry.")
+        metrics.incr('cache.stale')
+        return stale
+    response_cache.put(imdb_id, page, season, value)
+    return value
+
+# Artwork downloads run on their own pool so metadata fetching never waits on image transfers
+IMAGES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'public', 'images')
+DEFAULT_IMAGE_WORKERS = 6
+IMAGE_RETRIES = 3
+IMAGE_BACKOFF = 0.5  # seconds, doubled after each failed attempt
+IMAGE_TIMEOUT = 30
+IMAGE_REQUEST_INTERVAL = 0.05  # seconds between requests to an artwork host; the CDN is not held to --rate
+USER_AGENT = "Mozilla/5.0 (compatible; star-trek-tracker importer)"
+
+# Content-addressed image store (see ImageStore)
+IMAGE_STORE_DIR = os.path.join(IMAGES_DIR, 'store')
+IMAGE_MANIFEST = os.path.join(DATA_DIR, 'image_manifest.json')
+THUMBNAIL_WIDTHS = {'list': 288, 'detail': 400}  # 2x the rendered width in content-list / content-details
+THUMBNAIL_FORMATS = ('webp', 'avif')
+THUMBNAIL_QUALITY = 80
+
+def write_atomic(path, data):
+    """Write bytes to `path` via a temp file in the same directory and an atomic rename."""
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix='.part')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.chmod(tmp_path, 0o644)  # mkstemp creates 0600; these files are served publicly
+        os.replace(tmp_path, path)
+    except Exception:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+class ImageStore:
+    """
+    Content-addressed artwork store: images live at public/images/store/{sha256}{ext}, so
+    identical artwork is kept once however many prefixes use it. A manifest maps each logical
+    prefix (e.g. "movie_tt0079945") to its source URL and content hash; a prefix whose source
+    URL changes is downloaded again. Pre-sized thumbnails ({hash}.{variant}.{format}) are
+    written next to each image when Pillow is available. The formats present for every variant
+    are recorded in the manifest and appended to the web path as "?thumbs=webp,avif", so the app
+    only requests thumbnails that exist.
+    """
+    def __init__(self, store_dir=IMAGE_STORE_DIR, manifest_path=IMAGE_MANIFEST, legacy_dir=IMAGES_DIR):
+        self.store_dir = store_dir
+        self.manifest_path = manifest_path
+        self.legacy_dir = legacy_dir
+        self._lock = threading.Lock()
+        self._manifest = None
+        self._dirty = False
+        self._pillow_warned = False
+
+    def _entries(self):
+        with self._lock:
+            if self._manifest is None:
+                try:
+                    with open(self.manifest_path) as f:
+                        self._manifest = json.load(f)
+                except FileNotFoundError:
+                    self._manifest = {}
+                except Exception as e:
+                    log.warning(f"Error reading image manifest: {e}. Starting a new one.")
+                    self._manifest = {}
+            return self._manifest
+
+    def web_path(self, digest, ext, thumbs=()):
+        path = f"/images/store/{digest}{ext}"
+        return f"{path}?thumbs={','.join(thumbs)}" if thumbs else path
+
+    def thumbnail_formats(self, digest):
+        """Thumbnail formats written for every variant of an image."""
+        return [fmt for fmt in THUMBNAIL_FORMATS
+                if all(os.path.exists(os.path.join(self.store_dir, f"{digest}.{variant}.{fmt}")) for variant in THUMBNAIL_WIDTHS)]
+
+    def lookup(self, prefix, url):
+        """Web path of the stored image for `prefix` if it is current for `url`, else None."""
+        entry = self._entries().get(prefix)
+        if not entry or entry.get('url') != url:
+            return None
+        if not os.path.exists(os.path.join(self.store_dir, f"{entry['hash']}{entry['ext']}")):
+            return None
+        # Manifests written before thumbnails were recorded: look at the store instead
+        thumbs = entry['thumbs'] if 'thumbs' in entry else self.thumbnail_formats(entry['hash'])
+        return self.web_path(entry['hash'], entry['ext'], thumbs)
+
+    def adopt_legacy(self, prefix, url, ext):
+        """
+        Copy a pre-store image (public/images/{prefix}{ext}) into the store without downloading
+        it again. The original is left in place. Only used for prefixes the manifest has never seen.
+        """
+        if prefix in self._entries():
+            return None
+        legacy_path = os.path.join(self.legacy_dir, f"{prefix}{ext}")
+        if not os.path.exists(legacy_path):
+            return None
+        with open(legacy_path, 'rb') as f:
+            return self.add(prefix, url, f.read(), ext)
+
+    def add(self, prefix, url, data, ext):
+        """Store image bytes for `prefix` (deduplicated by content) and return the web path."""
+        digest = hashlib.sha256(data).hexdigest()
+        path = os.path.join(self.store_dir, f"{digest}{ext}")
+        if not os.path.exists(path):
+            write_atomic(path, data)
+        self.make_thumbnails(digest, data)
+        thumbs = self.thumbnail_formats(digest)
+        entries = self._entries()
+        with self._lock:
+            entries[prefix] = {'url': url, 'hash': digest, 'ext': ext, 'thumbs': thumbs}
+            self._dirty = True
+        return self.web_path(digest, ext, thumbs)
+
+    def make_thumbnails(self, digest, data):
+        """Write the missing {digest}.{variant}.{format} thumbnails. Needs Pillow; skipped without it."""
+        wanted = [(variant, width, fmt) for variant, width in THUMBNAIL_WIDTHS.items() for fmt in THUMBNAIL_FORMATS
+                  if not os.path.exists(os.path.join(self.store_dir, f"{digest}.{variant}.{fmt}"))]
+        if not wanted:
+            return
+        try:
+            from PIL import Image
+        except ImportError:
+            if not self._pillow_warned:
+                self._pillow_warned = True
+                log.warning("Pillow is not installed; skipping thumbnail generation (pip install Pillow).")
+            return
+        try:
+            with Image.open(io.BytesIO(data)) as source:
+                source.load()
+                image = source.convert('RGB')
+        except Exception as e:
+            log.error(f"Error decoding image {digest}: {e}")
+            return
+        for variant, width, fmt in wanted:
+            thumb = image.copy()
+            thumb.thumbnail((width, width * 2), Image.LANCZOS)
+            buf = io.BytesIO()
+            try:
+                thumb.save(buf, format=fmt.upper(), quality=THUMBNAIL_QUALITY)
+            except Exception as e:
+                # AVIF needs Pillow >= 11.3 (or pillow-avif-plugin); WebP is always attempted
+                log.debug(f"[IMAGE] cannot encode {fmt} thumbnail for {digest}: {e}")
+                continue
+            write_atomic(os.path.join(self.store_dir, f"{digest}.{variant}.{fmt}"), buf.getvalue())
+
+    def save(self):
+        """Persist the manifest if it changed."""
+        with self._lock:
+            if not self._dirty:
+                return
+            data = json.dumps(self._manifest, indent=2, sort_keys=True).encode('utf-8')
+            self._dirty = False
+        write_atomic(self.manifest_path, data)
+
+image_store = ImageStore()
+
+class ImageDownloadError(Exception):
+    def __init__(self, message, retryable=True):
+        super().__init__(message)
+        self.retryable = retryable
+
+class ImageDownloader:
+    """
+    Queue of artwork downloads served by a pool of worker threads. Each worker keeps one
+    persistent (keep-alive) HTTPS connection per host, and failed transfers are retried with
+    exponential backoff. Downloaded bytes go into the content-addressed ImageStore, whose
+    files are written atomically so an interrupted run never leaves a truncated image behind.
+    Requests are spaced `interval` seconds apart per artwork host, independently of IMDb pages.
+    """
+    def __init__(self, store=None, workers=DEFAULT_IMAGE_WORKERS, interval=IMAGE_REQUEST_INTERVAL):
+        self.store = store or image_store
+        self.workers = workers
+        self.interval = interval
+        self._pool = None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _executor(self):
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=max(1, self.workers), thread_name_prefix="imdb-image")
+            return self._pool
+
+    def submit(self, url, prefix):
+        """
+        Queue `url` for the image store under `prefix`. Returns a Future resolving to the web
+        path (e.g. "/images/store/<sha256>.jpg"), or the original URL if the download fails.
+        """
+        future = Future()
+        if not url:
+            future.set_result(None)
+            return future
+        stored = self.store.lookup(prefix, url)
+        if stored:
+            metrics.incr('images.reused')
+            future.set_result(stored)  # Return URL path for web access
+            return future
+        _, ext = os.path.splitext(urlparse(url).path)
+        return self._executor().submit(self._download, url, prefix, (ext or '.jpg').lower())
+
+    def _download(self, url, prefix, ext):
+        try:
+            adopted = self.store.adopt_legacy(prefix, url, ext)
+            if adopted:
+                metrics.incr('images.reused')
+                return adopted
+        except Exception as e:
+            log.error(f"Error adopting existing image {prefix}{ext}: {e}")
+        delay = IMAGE_BACKOFF
+        for attempt in range(1, IMAGE_RETRIES + 1):
+            try:
+                started = time.monotonic()
+                data = self._fetch(url)
+                metrics.incr('images.seconds', time.monotonic() - started)
+                metrics.incr('images.bytes', len(data))
+                metrics.incr('images.downloaded')
+                return self.store.add(prefix, url, data, ext)  # Return URL path for web access
+            except Exception as e:
+                retryable = getattr(e, 'retryable', True)
+                if not retryable or attempt == IMAGE_RETRIES:
+                    log.error(f"Error downloading image from {url}: {e}")
+                    metrics.incr('images.failed')
+                    return url
+                log.debug(f"[IMAGE] attempt {attempt} failed for {url}: {e}; retrying in {delay:.1f}s")
+                time.sleep(delay)
+                delay *= 2
+
+    def _connection(self, scheme, host):
+        conns = getattr(self._local, 'conns', None)
+        if conns is None:
+            conns = self._local.conns = {}
+        conn = conns.get((scheme, host))
+        if conn is None:
+            import http.client
+            cls = http.client.HTTPSConnection if scheme == 'https' else http.client.HTTPConnection
+            conn = conns[(scheme, host)] = cls(host, timeout=IMAGE_TIMEOUT)
+        return conn
+
+    def _drop_connection(self, scheme, host):
+        conn = getattr(self._local, 'conns', {}).pop((scheme, host), None)
+        if conn is not None:
+            conn.close()
+
+    def _fetch(self, url, redirects=3):
+        parsed = urlparse(url)
+        path = parsed.path or '/'
+        if parsed.query:
+            path += '?' + parsed.query
+        scheduler.wait(parsed.netloc, interval=self.interval)
+        conn = self._connection(parsed.scheme, parsed.netloc)
+        try:
+            conn.request('GET', path, headers={'User-Agent': USER_AGENT, 'Connection': 'keep-alive'})
+            resp = conn.getresponse()
+            body = resp.read()
+        except Exception:
+            # Stale keep-alive socket or network error: reconnect on the next attempt
+            self._drop_connection(parsed.scheme, parsed.netloc)
+            raise
+        if resp.will_close:
+            self._drop_connection(parsed.scheme, parsed.netloc)
+        if resp.status in (301, 302, 303, 307, 308) and redirects > 0 and resp.getheader('Location'):
+            return self._fetch(urljoin(url, resp.getheader('Location')), redirects - 1)
+        if resp.status == 429 or resp.status >= 500:
+            raise ImageDownloadError(f"HTTP {resp.status}")
+        if resp.status != 200:
+            raise ImageDownloadError(f"HTTP {resp.status}", retryable=False)
+        if not body:
+            raise ImageDownloadError("empty response body")
+        return body
+
+    def close(self):
+        """Wait for queued downloads to finish and shut the workers down."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True)
+        self.store.save()
+
+image_downloader = ImageDownloader()
+
+def download_image(url, prefix):
+    """
+    Queue an image download into the image store under the given prefix.
+    Returns a Future for the web path (e.g. "/images/store/<sha256>.jpg"), or for the original
+    URL if the download fails. Use resolve_artwork() to wait for the results.
+    """
+    return image_downloader.submit(url, prefix)
+
+def resolve_artwork(data):
+    """Replace pending download Futures anywhere in an imported record with their results."""
+    if isinstance(data, Future):
+        return data.result()
+    if isinstance(data, dict):
+        return {k: resolve_artwork(v) for k, v in data.items()}
+    if isinstance(data, list):
+        return [resolve_artwork(v) for v in data]
+    return data
+
+# Streaming output (import --ndjson): one JSON record per line
+NDJSON_FLUSH_RECORDS = 50
+NDJSON_FLUSH_SECONDS = 1.0
+NDJSON_QUEUE_RECORDS = 1000  # emit() blocks while this many records wait to be written
+DEFAULT_NDJSON_PATH = os.path.join(DATA_DIR, 'catalog.ndjson')
+
+class NdjsonWriter:
+    """
+    Write catalog records as NDJSON from a background thread. emit() never blocks on
+    artwork: pending download Futures in a record are resolved by the writer thread, in
+    emit order, before the line is written. The stream is flushed every
+    NDJSON_FLUSH_RECORDS records or NDJSON_FLUSH_SECONDS, whichever comes first. At most
+    NDJSON_QUEUE_RECORDS records are queued, so a slow stream holds back the fetch threads
+    instead of piling up records in memory.
+    """
+    _STOP = object()
+
+    def __init__(self, stream):
+        self.stream = stream
+        self._queue = queue.Queue(maxsize=NDJSON_QUEUE_RECORDS)
+        self._thread = threading.Thread(target=self._run, name="ndjson-writer", daemon=True)
+        self._thread.start()
+
+    def emit(self, record_type, record):
+        self._queue.put({'type': record_type, **record})
+
+    def _run(self):
+        unflushed = 0
+        last_flush = time.monotonic()
+        while True:
+            try:
+                record = self._queue.get(timeout=NDJSON_FLUSH_SECONDS)
+            except queue.Empty:
+                record = None
+            if record is self._STOP:
+                break
+            if record is not None:
+                try:
+                    self.stream.write(json.dumps(resolve_artwork(record)) + "\n")
+                    unflushed += 1
+                except Exception as e:
+                    log.error(f"Error writing {record.get('type')} record: {e}")
+            if unflushed and (unflushed >= NDJSON_FLUSH_RECORDS or time.monotonic() - last_flush >= NDJSON_FLUSH_SECONDS):
+                self.stream.flush()
+                unflushed = 0
+                last_flush = time.monotonic()
+        self.stream.flush()
+
+    def close(self):
+        """Write everything still queued, flush, and stop the writer thread."""
+        self._queue.put(self._STOP)
+        self._thread.join()
+
+record_writer = None  # NdjsonWriter while an import is streaming
+
+def emit_record(record_type, record):
+    if record_writer is not None:
+        record_writer.emit(record_type, record)
+
+def emit_season(show_imdb_id, season_data):
+    """Stream a season record followed by one record per episode."""
+    if record_writer is None:
+        return
+    season = {k: v for k, v in season_data.items() if k != 'episodes'}
+    emit_record('season', dict(season, showImdbId=show_imdb_id))
+    for episode in season_data.get('episodes') or []:
+        emit_record('episode', dict(episode, showImdbId=show_imdb_id, seasonNumber=season_data['number']))
+
+def emit_series(series_data):
+    """Stream a complete show (as carried over from a previous import)."""
+    show = series_data.get('show')
+    if not show:
+        return
+    emit_record('show', show)
+    for season_data in series_data.get('seasons') or []:
+        emit_season(show.get('imdbId'), season_data)
+
+# Checkpoint journal: one line per completed unit (season, series or movie) of the running import
+CHECKPOINT_PATH = os.path.join(DATA_DIR, 'import_checkpoint.ndjson')
+
+checkpoint_writer = None  # NdjsonWriter on the journal while an import runs
+failed_titles = []  # (name, kept) for series/movies of the running import that did not complete;
+                    # kept: the title's record from the previous import stands in for it
+
+class ImportIncompleteError(RuntimeError):
+    """
+    Raised at the end of an import in which titles without an earlier record failed (unless
+    partial output is allowed); the journal is kept for --resume.
+    """
+
+def checkpoint(unit, **fields):
+    """Record a completed unit of work in the checkpoint journal."""
+    if checkpoint_writer is not None:
+        checkpoint_writer.emit(unit, fields)
+
+def load_checkpoint(path=CHECKPOINT_PATH):
+    """
+    Read the journal left by an interrupted import. Returns None if there is none, else a dict
+    with completed 'shows' and 'movies' by imdbId and completed 'seasons' as
+    {show imdbId: {season number: season}}. A torn last line from the interruption is ignored.
+    """
+    journal = {'shows': {}, 'seasons': {}, 'movies': {}}
+    try:
+        f = open(path)
+    except FileNotFoundError:
+        return None
+    with f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            unit = entry.get('type')
+            if unit == 'season':
+                journal['seasons'].setdefault(entry['imdbId'], {})[entry['season']['number']] = entry['season']
+            elif unit == 'series':
+                journal['shows'][entry['imdbId']] = entry['show']
+            elif unit == 'movie':
+                journal['movies'][entry['imdbId']] = entry['movie']
+    return journal
+
+def merge_seasons(previous, done_seasons):
+    """Overlay seasons completed in an interrupted run on a show's previous record."""
+    merged = {s['number']: s for s in ((previous or {}).get('seasons') or [])}
+    merged.update(done_seasons)
+    return {'show': (previous or {}).get('show'), 'seasons': [merged[n] for n in sorted(merged)]}
+
+# Bulk runtimes from IMDb's title.basics dataset (https://datasets.imdbws.com/title.basics.tsv.gz)
+TITLE_BASICS_PATH = os.path.join(DATA_DIR, 'title.basics.tsv.gz')
+RUNTIME_INDEX_PATH = os.path.join(DATA_DIR, 'title_runtimes.bin')
+RUNTIME_INDEX_MAGIC = b'STRTIDX2'
+RUNTIME_INDEX_HEADER = struct.Struct('<QqQ')  # source size, source mtime (ns), title count
+
+def tconst_number(imdb_id):
+    """'tt0060028' -> 60028; None for anything that is not a title id."""
+    if isinstance(imdb_id, str) and imdb_id.startswith('tt') and imdb_id[2:].isdigit():
+        return int(imdb_id[2:])
+    return None
+
+class RuntimeIndex:
+    """
+    Runtime lookups against a local copy of IMDb's title.basics dataset (TSV, optionally gzipped).
+
+    The dataset is streamed once into a compact index file next to it: a header, the sorted
+    tconst numbers (uint32) and their runtimes (uint16), in native byte order. Lookups
+    memory-map that file and binary-search it, so the dataset is never held in memory. The
+    header records the size and mtime of the dataset the index was built from; the index is
+    rebuilt when they no longer match. Without a dataset every lookup misses.
+    """
+    def __init__(self, source=None, index_path=RUNTIME_INDEX_PATH):
+        self.source = source
+        self.index_path = index_path
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._ids = None
+        self._runtimes = None
+
+    def load(self):
+        """Open the index, building it first if needed. Called by the first lookup."""
+        with self._lock:
+            if self._loaded:
+                return
+            self._loaded = True
+            if not self.source or not os.path.exists(self.source):
+                return
+            try:
+                stamp = self.source_stamp()
+                if self.indexed_stamp() != stamp:
+                    self.build(stamp)
+                self._open()
+            except Exception as e:
+                log.error(f"Error loading bulk runtimes from {self.source}: {e}. Using episode pages instead.")
+                self._ids = self._runtimes = None
+
+    def source_stamp(self):
+        """(size, mtime in ns) of the dataset, as recorded in the index header."""
+        st = os.stat(self.source)
+        return st.st_size, st.st_mtime_ns
+
+    def indexed_stamp(self):
+        """The source stamp stored in the index file, or None if there is no valid index."""
+        try:
+            with open(self.index_path, 'rb') as f:
+                header = f.read(len(RUNTIME_INDEX_MAGIC) + RUNTIME_INDEX_HEADER.size)
+        except FileNotFoundError:
+            return None
+        if len(header) < len(RUNTIME_INDEX_MAGIC) + RUNTIME_INDEX_HEADER.size or not header.startswith(RUNTIME_INDEX_MAGIC):
+            return None
+        size, mtime_ns, _ = RUNTIME_INDEX_HEADER.unpack_from(header, len(RUNTIME_INDEX_MAGIC))
+        return size, mtime_ns
+
+    def build(self, stamp=None):
+        """Stream the dataset into the index file, keeping only titles that have a runtime."""
+        started = time.monotonic()
+        # Stat before reading: a dataset replaced mid-build then mismatches and is indexed again
+        stamp = stamp or self.source_stamp()
+        ids = array('I')
+        runtimes = array('H')
+        in_order = True
+        opener = gzip.open if self.source.endswith('.gz') else open
+        with opener(self.source, 'rt', encoding='utf-8', newline='') as f:
+            header = next(f).rstrip('\n').split('\t')
+            id_col, runtime_col = header.index('tconst'), header.index('runtimeMinutes')
+            for line in f:
+                fields = line.rstrip('\n').split('\t', runtime_col + 1)
+                runtime = fields[runtime_col] if len(fields) > runtime_col else ''
+                number = tconst_number(fields[id_col])
+                if not runtime.isdigit() or number is None or number > 0xFFFFFFFF:
+                    continue  # \N = runtime unknown
+                if ids and number <= ids[-1]:
+                    in_order = False
+                ids.append(number)
+                runtimes.append(min(int(runtime), 0xFFFF))
+        if not in_order:
+            pairs = sorted(zip(ids, runtimes))
+            ids = array('I', (i for i, _ in pairs))
+            runtimes = array('H', (r for _, r in pairs))
+        header = RUNTIME_INDEX_MAGIC + RUNTIME_INDEX_HEADER.pack(*stamp, len(ids))
+        write_atomic(self.index_path, header + ids.tobytes() + runtimes.tobytes())
+        log.info(f"Indexed {len(ids)} runtimes from {self.source} in {time.monotonic() - started:.1f}s")
+
+    def _open(self):
+        with open(self.index_path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if mapped[:len(RUNTIME_INDEX_MAGIC)] != RUNTIME_INDEX_MAGIC:
+            raise ValueError(f"{self.index_path} is not a runtime index")
+        _, _, count = RUNTIME_INDEX_HEADER.unpack_from(mapped, len(RUNTIME_INDEX_MAGIC))
+        offset = len(RUNTIME_INDEX_MAGIC) + RUNTIME_INDEX_HEADER.size
+        view = memoryview(mapped)
+        self._ids = view[offset:offset + 4 * count].cast('I')
+        self._runtimes = view[offset + 4 * count:offset + 6 * count].cast('H')
+
+    def lookup(self, imdb_id):
+        """Runtime in minutes for a title id, or None if the dataset does not have one."""
+        self.load()
+        number = tconst_number(imdb_id)
+        if self._ids is None or number is None:
+            return None
+        i = bisect_left(self._ids, number)
+        if i < len(self._ids) and self._ids[i] == number:
+            return self._runtimes[i] or None
+        return None
+
+    def lookup_many(self, imdb_ids):
+        """{imdb_id: runtime} for the ids the dataset has a runtime for."""
+        found = {}
+        for imdb_id in imdb_ids:
+            runtime = self.lookup(imdb_id)
+            if runtime:
+                found[imdb_id] = runtime
+        return found
+
+runtime_index = RuntimeIndex()
 
 def parse_air_date(air_date_str):
     """
@@ -119,32 +1155,230 @@ def normalize_runtime(value):
         return None
     return None
 
-def fetch_show_and_episodes(imdb_id, order, max_seasons=25):
+RUNTIME_ATTRS = ('running_time', 'runtime', 'runtimes', 'runtime_minutes', 'duration')
+_runtime_attrs = {}  # title class -> the RUNTIME_ATTRS it has, in probing order
+
+def runtime_attrs_for(obj):
+    """
+    Runtime-like attributes of `obj`. Resolved once per class for dataclasses (CinemagoerNG's
+    title models), whose attributes are fixed; other objects are probed each time.
+    """
+    cls = type(obj)
+    attrs = _runtime_attrs.get(cls)
+    if attrs is None:
+        if not dataclasses.is_dataclass(cls):
+            return tuple(attr for attr in RUNTIME_ATTRS if hasattr(obj, attr))
+        names = {f.name for f in dataclasses.fields(cls)} | set(dir(cls))
+        attrs = _runtime_attrs[cls] = tuple(attr for attr in RUNTIME_ATTRS if attr in names)
+    return attrs
+
+def find_runtime(obj):
+    """Return the runtime of a title object in minutes (or None)."""
+    runtime = None
+    for attr in runtime_attrs_for(obj):
+        runtime = normalize_runtime(getattr(obj, attr, None))
+        if runtime:
+            break
+    return runtime
+
+def page_runtime(imdb_id, page="main", content_class=None):
+    """Runtime from one of a title's pages, looked up at most once per run."""
+    key = (imdb_id, page, None)
+    return page_memo.derive(key, 'runtime', lambda: find_runtime(get_title(imdb_id, content_class=content_class, page=page)))
+
+def iter_season_pages(imdb_id, max_seasons, prefetch=None, start=1):
+    """
+    Yield (season_number, episodes page) in season order, from `start` up to `max_seasons`,
+    while keeping up to `prefetch` season pages in flight on the fetch pool. Fetches still
+    pending when the caller stops iterating (e.g. at the first empty season) are cancelled.
+    """
+    prefetch = max(1, prefetch or SEASON_PREFETCH)
+    pool = fetch_pool()
+    in_flight = deque()
+    next_season = start
+    try:
+        while True:
+            while next_season <= max_seasons and len(in_flight) < prefetch:
+                log.debug(f"[SEASON] fetching episodes page imdb_id={imdb_id} season={next_season}")
+                future = pool.submit(get_title, imdb_id, page="episodes", season=str(next_season))
+                in_flight.append((next_season, future))
+                next_season += 1
+            if not in_flight:
+                return
+            season_number, future = in_flight.popleft()
+            try:
+                page = future.result()
+            except Exception as e:
+                if http_status(e) != 404:
+                    raise
+                page = None  # a season past the last one; the caller stops at the first empty season
+            yield season_number, page
+    finally:
+        for _, future in in_flight:
+            future.cancel()
+
+def fetch_episode_runtime(ep_full_id):
+    """Fetch an episode's own title page and return its runtime (silent on errors)."""
+    try:
+        log.debug(f"[EP] fetch details imdb_id={ep_full_id}")
+        metrics.incr('episode_detail_fallbacks')
+        return page_runtime(ep_full_id, content_class='episode')
+    except CircuitOpenError:
+        raise
+    except Exception:
+        return None
+
+def build_season(imdb_id, season_number, episodes_for_season, default_ep_runtime):
+    """
+    Build the season dict from one episodes page. Episodes missing a runtime have their
+    detail pages looked up concurrently; results are applied in episode order.
+    """
+    season_data = {'number': season_number, 'imdbRating': None, 'episodes': [], 'runtime': None}
+    episode_ratings = []
+    season_total_runtime = 0
+    season_has_runtime = False
+
+    # Episode runtime: from the episodes page, else the bulk dataset, else (fanned out) each
+    # episode's own detail page
+    pool = fetch_pool()
+    runtimes = {}
+    missing = {}
+    detail_lookups = {}
+    for ep_key, ep in episodes_for_season.items():
+        runtimes[ep_key] = find_runtime(ep)
+        if runtimes[ep_key] is None and getattr(ep, 'imdb_id', None):
+            missing[ep_key] = ep.imdb_id
+    bulk = runtime_index.lookup_many(missing.values())
+    if bulk:
+        metrics.incr('episode_runtime_bulk', len(bulk))
+    for ep_key, ep_id in missing.items():
+        if ep_id in bulk:
+            runtimes[ep_key] = bulk[ep_id]
+        else:
+            detail_lookups[ep_key] = pool.submit(fetch_episode_runtime, ep_id)
+
+    for ep_key, ep in episodes_for_season.items():
+        ep_title = getattr(ep, 'title', '')
+        air_date = getattr(ep, 'release_date', None)
+        if air_date is not None and not isinstance(air_date, str):
+            air_date = air_date.isoformat()
+        ep_artwork = getattr(ep, 'primary_image', None)
+        if ep_artwork:
+            ep_artwork = download_image(ep_artwork, f"series_{imdb_id}_season_{season_number}_ep_{getattr(ep, 'episode', '')}")
+        ep_rating = getattr(ep, 'rating', None)
+        if ep_rating is not None:
+            try:
+                ep_rating = float(ep_rating)
+                episode_ratings.append(ep_rating)
+            except Exception as conv_err:
+                log.error(f"Error converting rating for episode {ep_key}: {conv_err}")
+                ep_rating = None
+
+        ep_description = getattr(ep, 'plot', '')
+        if isinstance(ep_description, dict):
+            ep_description = ep_description.get('en-US', next(iter(ep_description.values()), ''))
+
+        ep_runtime = runtimes[ep_key]
+        if ep_key in detail_lookups:
+            ep_runtime = detail_lookups[ep_key].result()
+        if ep_runtime is None and default_ep_runtime:
+            # Use show-level runtime as per-episode fallback
+            ep_runtime = default_ep_runtime
+        if ep_runtime:
+            season_total_runtime += ep_runtime
+            season_has_runtime = True
+        try:
+            log.debug(f"[EP] S{season_number:02}E{getattr(ep,'episode', '')}: title={ep_title} rating={ep_rating} runtime={ep_runtime} air_date={air_date} has_imdb_id={hasattr(ep,'imdb_id')}")
+        except Exception:
+            pass
+
+        episode_data = {
+            'imdbId': getattr(ep, 'imdb_id', None),
+            'title': ep_title,
+            'episodeNumber': getattr(ep, 'episode', None),
+            'airDate': air_date,
+            'artworkUrl': ep_artwork,
+            'imdbRating': ep_rating,
+            'description': ep_description,
+            'runtime': ep_runtime,
+        }
+        season_data['episodes'].append(episode_data)
+
+    if episode_ratings:
+        avg_rating = sum(episode_ratings) / len(episode_ratings)
+        season_data['imdbRating'] = avg_rating
+
+    if season_has_runtime:
+        season_data['runtime'] = season_total_runtime
+    elif default_ep_runtime and len(season_data['episodes']) > 0:
+        # No episode runtimes found; compute season runtime from default per-episode runtime
+        season_data['runtime'] = default_ep_runtime * len(season_data['episodes'])
+
+    page_memo.release(missing.values())  # episode detail pages are only needed for this season
+    return season_data
+
+def season_has_episodes(series, season_number):
+    season_str = str(season_number)
+    return hasattr(series, 'episodes') and season_str in series.episodes and bool(series.episodes[season_str])
+
+def season_needs_refresh(season_data):
+    """True if a previously imported season has episodes still missing an air date or rating."""
+    episodes = season_data.get('episodes') or []
+    return not episodes or any(not ep.get('airDate') or ep.get('imdbRating') is None for ep in episodes)
+
+def last_reported_season(meta):
+    """Highest season number the series page lists (CinemagoerNG's `seasons`), or None."""
+    numbers = [int(s) for s in getattr(meta, 'seasons', None) or [] if str(s).isdigit()]
+    return max(numbers, default=None)
+
+def fetch_show_and_episodes(imdb_id, order, max_seasons=25, previous=None, done=None):
     """
     Fetch a TV series, then for each season update with episode data.
-    Returns a JSON structure with all data.
+    Returns a JSON structure with all data. Raises if the series page or any season page
+    fails; seasons completed before that are already in the checkpoint journal.
+
+    With `previous` (this show's record from an earlier import), only seasons from the last
+    known season onward, plus older seasons that still need a refresh, are fetched; all
+    other seasons are carried over unchanged. `done` ({number: season}) holds the seasons an
+    interrupted run of the same import already fetched (see --resume); they are kept and not
+    fetched again, and fetching continues after the last of them.
     """
     result = {"show": None, "seasons": []}
+    seasons = {}
+    streamed = set()
+
+    def store_season(season_data):
+        seasons[season_data['number']] = season_data
+        result['seasons'] = [seasons[n] for n in sorted(seasons)]
+        if result['show'] is not None:
+            checkpoint('season', imdbId=imdb_id, season=season_data)
+            emit_season(imdb_id, season_data)
+            streamed.add(season_data['number'])
+
+    if previous:
+        for season_data in previous.get('seasons') or []:
+            store_season(season_data)
+    known = sorted(seasons)
+    done = done or {}
+    for number in sorted(done):
+        store_season(done[number])
     try:
         # Fetch series metadata (try reference, then fallback to main)
         meta = None
         try:
-            dbg(f"[META] fetching reference page for {imdb_id}")
-            meta = web.get_title(imdb_id=imdb_id, page="reference")
-            dbg(f"[META] reference fetched type={type(meta)} title={getattr(meta,'title',None)} has_imdb_id={hasattr(meta,'imdb_id')}")
+            log.debug(f"[META] fetching reference page for {imdb_id}")
+            meta = get_title(imdb_id, page="reference")
+            log.debug(f"[META] reference fetched type={type(meta)} title={getattr(meta,'title',None)} has_imdb_id={hasattr(meta,'imdb_id')}")
         except Exception as e:
-            print(f"Error fetching reference page for {imdb_id}: {e}. Falling back to main page...")
-            try:
-                dbg(f"[META] fetching main page for {imdb_id}")
-                meta = web.get_title(imdb_id=imdb_id, page="main")
-                dbg(f"[META] main fetched type={type(meta)} title={getattr(meta,'title',None)} has_imdb_id={hasattr(meta,'imdb_id')}")
-            except Exception as e2:
-                print(f"Error fetching main page for {imdb_id}: {e2}")
-                return result
+            if not should_fall_back(e):
+                raise
+            log.warning(f"Error fetching reference page for {imdb_id}: {e}. Falling back to main page...")
+            log.debug(f"[META] fetching main page for {imdb_id}")
+            meta = get_title(imdb_id, page="main")
+            log.debug(f"[META] main fetched type={type(meta)} title={getattr(meta,'title',None)} has_imdb_id={hasattr(meta,'imdb_id')}")
 
         if not meta:
-            print(f"Could not retrieve series with IMDb ID: {imdb_id}")
-            return result
+            raise LookupError(f"Could not retrieve series with IMDb ID: {imdb_id}")
 
         # Title normalization
         original_title = getattr(meta, 'title', '')
@@ -170,118 +1404,63 @@ def fetch_show_and_episodes(imdb_id, order, max_seasons=25):
         series_rating = getattr(meta, 'rating', None)
 
         result['show'] = {
+            'imdbId': imdb_id,
             'title': title,
             'description': description,
             'order': order,
             'artworkUrl': artwork_url,
             'imdbRating': float(series_rating) if series_rating else None,
         }
+        emit_record('show', result['show'])
         # Note: verbose attribute dumps removed for performance
 
-        # Seasons and episodes
-        for season_number in range(1, max_seasons + 1):
-            season_str = str(season_number)
-            dbg(f"[SEASON] fetching episodes page imdb_id={imdb_id} season={season_str}")
-            series = web.get_title(imdb_id=imdb_id, page="episodes", season=season_str)
-            dbg(f"[SEASON] fetched type={type(series)} has_attr_episodes={hasattr(series,'episodes')}")
-            if not hasattr(series, 'episodes') or season_str not in series.episodes or not series.episodes[season_str]:
-                print(f"[SEASON] {title} S{season_number:02}: no episodes found; stopping.")
-                break
-
-            episodes_for_season = series.episodes[season_str]
-            try:
-                dbg(f"[SEASON] {title} S{season_number:02}: episodes_count={len(episodes_for_season)} keys_sample={(list(episodes_for_season.keys())[:3])}")
-            except Exception:
-                pass
-            # Minimal logging only
-            # print(f"[SEASON] {title} S{season_number:02}: episode_count={len(episodes_for_season)}")
-            # Determine default per-episode runtime from series meta if available
+        # Determine default per-episode runtime from series meta if available
+        default_ep_runtime = None
+        try:
+            default_ep_runtime = normalize_runtime(getattr(meta, 'runtime', None))
+            log.debug(f"[SEASON] default_ep_runtime={default_ep_runtime}")
+        except Exception:
             default_ep_runtime = None
+
+        # Incremental: refetch from the last known season (it may still be airing) and refresh
+        # stale older ones. Seasons this run already fetched are skipped, resuming after the last.
+        last_known = known[-1] if known else 1
+        start_season = max([n + 1 for n in done if n >= last_known] or [last_known])
+        stale = [n for n in known if n < last_known and n not in done and season_needs_refresh(seasons[n])]
+        if known:
+            log.info(f"[SEASON] {title}: incremental from S{last_known:02}, refreshing {len(stale)} older season(s)")
+        if done:
+            log.info(f"[SEASON] {title}: resuming at S{start_season:02}, {len(done)} season(s) already fetched")
+        pool = fetch_pool()
+        stale_pages = [(n, pool.submit(get_title, imdb_id, page="episodes", season=str(n))) for n in stale]
+        for season_number, future in stale_pages:
             try:
-                default_ep_runtime = normalize_runtime(getattr(meta, 'runtime', None))
-                dbg(f"[SEASON] default_ep_runtime={default_ep_runtime}")
-            except Exception:
-                default_ep_runtime = None
-            season_data = {'number': season_number, 'imdbRating': None, 'episodes': [], 'runtime': None}
-            episode_ratings = []
-            season_total_runtime = 0
-            season_has_runtime = False
-
-            for ep_key, ep in episodes_for_season.items():
-                ep_title = getattr(ep, 'title', '')
-                air_date = getattr(ep, 'release_date', None)
-                if air_date is not None and not isinstance(air_date, str):
-                    air_date = air_date.isoformat()
-                ep_artwork = getattr(ep, 'primary_image', None)
-                if ep_artwork:
-                    ep_artwork = download_image(ep_artwork, f"series_{imdb_id}_season_{season_number}_ep_{getattr(ep, 'episode', '')}")
-                ep_rating = getattr(ep, 'rating', None)
-                if ep_rating is not None:
-                    try:
-                        ep_rating = float(ep_rating)
-                        episode_ratings.append(ep_rating)
-                    except Exception as conv_err:
-                        print(f"Error converting rating for episode {ep_key}: {conv_err}")
-                        ep_rating = None
-
-                ep_description = getattr(ep, 'plot', '')
-                if isinstance(ep_description, dict):
-                    ep_description = ep_description.get('en-US', next(iter(ep_description.values()), ''))
-
-                # Episode runtime (attempt multiple attribute names)
-                ep_runtime = None
-                for attr in ('running_time', 'runtime', 'runtimes', 'runtime_minutes', 'duration'):
-                    if hasattr(ep, attr):
-                        ep_runtime = normalize_runtime(getattr(ep, attr))
-                        if ep_runtime:
-                            break
-                # If not found, try fetching episode details page (silent on errors)
-                if ep_runtime is None and hasattr(ep, 'imdb_id') and getattr(ep, 'imdb_id'):
-                    try:
-                        ep_full_id = getattr(ep, 'imdb_id')
-                        dbg(f"[EP] fetch details imdb_id={ep_full_id} for S{season_number:02}E{getattr(ep,'episode', '')}")
-                        ep_full = web.get_title(imdb_id=ep_full_id)
-                        for attr in ('running_time', 'runtime', 'runtimes', 'runtime_minutes', 'duration'):
-                            if hasattr(ep_full, attr):
-                                ep_runtime = normalize_runtime(getattr(ep_full, attr))
-                                if ep_runtime:
-                                    break
-                    except Exception:
-                        pass
-                if ep_runtime is None and default_ep_runtime:
-                    # Use show-level runtime as per-episode fallback
-                    ep_runtime = default_ep_runtime
-                if ep_runtime:
-                    season_total_runtime += ep_runtime
-                    season_has_runtime = True
+                series = future.result()
+            except CircuitOpenError:
+                raise
+            except Exception as e:
+                log.warning(f"Error refreshing {title} S{season_number:02}: {e}. Keeping previous data.")
+                continue
+            if season_has_episodes(series, season_number):
+                store_season(build_season(imdb_id, season_number, series.episodes[str(season_number)], default_ep_runtime))
+
+        # Seasons and episodes (season pages are prefetched a few at a time, never past the last
+        # season the series page lists)
+        last_season = min(max_seasons, last_reported_season(meta) or max_seasons)
+        with closing(iter_season_pages(imdb_id, last_season, start=start_season)) as season_pages:
+            for season_number, series in season_pages:
+                season_str = str(season_number)
+                log.debug(f"[SEASON] fetched type={type(series)} has_attr_episodes={hasattr(series,'episodes')}")
+                if not season_has_episodes(series, season_number):
+                    log.info(f"[SEASON] {title} S{season_number:02}: no episodes found; stopping.")
+                    break
+
+                episodes_for_season = series.episodes[season_str]
                 try:
-                    dbg(f"[EP] S{season_number:02}E{getattr(ep,'episode', '')}: title={ep_title} rating={ep_rating} runtime={ep_runtime} air_date={air_date} has_imdb_id={hasattr(ep,'imdb_id')}")
+                    log.debug(f"[SEASON] {title} S{season_number:02}: episodes_count={len(episodes_for_season)} keys_sample={(list(episodes_for_season.keys())[:3])}")
                 except Exception:
                     pass
-                # Minimal logging only
-
-                episode_data = {
-                    'title': ep_title,
-                    'episodeNumber': getattr(ep, 'episode', None),
-                    'airDate': air_date,
-                    'artworkUrl': ep_artwork,
-                    'imdbRating': ep_rating,
-                    'description': ep_description,
-                    'runtime': ep_runtime,
-                }
-                season_data['episodes'].append(episode_data)
-
-            if episode_ratings:
-                avg_rating = sum(episode_ratings) / len(episode_ratings)
-                season_data['imdbRating'] = avg_rating
-
-            if season_has_runtime:
-                season_data['runtime'] = season_total_runtime
-            elif default_ep_runtime and len(season_data['episodes']) > 0:
-                # No episode runtimes found; compute season runtime from default per-episode runtime
-                season_data['runtime'] = default_ep_runtime * len(season_data['episodes'])
-
-            result['seasons'].append(season_data)
+                store_season(build_season(imdb_id, season_number, episodes_for_season, default_ep_runtime))
 
         # Aggregate show runtime from seasons
         total_runtime = 0
@@ -295,11 +1474,15 @@ def fetch_show_and_episodes(imdb_id, order, max_seasons=25):
             result['show']['runtime'] = total_runtime
         # Minimal logging only
 
+        checkpoint('series', imdbId=imdb_id, show=result['show'])
         return result
-
-    except Exception as e:
-        print(f"Error importing {title if 'title' in locals() else imdb_id}: {e}")
-        return result
+    finally:
+        if result['show'] is not None:
+            # Stream carried-over seasons that were not refetched, then the show with its final runtime
+            for number in sorted(seasons):
+                if number not in streamed:
+                    emit_season(imdb_id, seasons[number])
+            emit_record('show', result['show'])
 
 def fetch_movie(imdb_id, order):
     """
@@ -309,14 +1492,13 @@ def fetch_movie(imdb_id, order):
     # Try reference page first for richer data, then fallback to main
     movie = None
     try:
-        movie = web.get_title(imdb_id=imdb_id, page="reference")
-    except Exception:
-        try:
-            movie = web.get_title(imdb_id=imdb_id, page="main")
-        except Exception:
-            movie = web.get_title(imdb_id=imdb_id)
+        movie = get_title(imdb_id, page="reference")
+    except Exception as e:
+        if not should_fall_back(e):
+            raise
+        movie = get_title(imdb_id, page="main")
     if not movie:
-        print(f"Could not retrieve movie with IMDb ID: {imdb_id}")
+        log.error(f"Could not retrieve movie with IMDb ID: {imdb_id}")
         return None
         
     title = movie.title
@@ -329,26 +1511,21 @@ def fetch_movie(imdb_id, order):
         artwork_url = download_image(artwork_url, f"movie_{imdb_id}")
     movie_rating = movie.rating if hasattr(movie, 'rating') else None
     # Movie runtime
-    mv_runtime = None
-    for attr in ('running_time', 'runtime', 'runtimes', 'runtime_minutes', 'duration'):
-        if hasattr(movie, attr):
-            mv_runtime = normalize_runtime(getattr(movie, attr))
-            if mv_runtime:
-                break
-    # If still none, try to fetch again using alternate page
+    mv_runtime = find_runtime(movie)
+    if mv_runtime is None:
+        mv_runtime = runtime_index.lookup(imdb_id)
+    # If still none, try the main page (already loaded if the reference page failed)
     if mv_runtime is None:
         try:
-            alt = web.get_title(imdb_id=imdb_id, page="main")
-            for attr in ('running_time', 'runtime', 'runtimes', 'runtime_minutes', 'duration'):
-                if hasattr(alt, attr):
-                    mv_runtime = normalize_runtime(getattr(alt, attr))
-                    if mv_runtime:
-                        break
+            mv_runtime = page_runtime(imdb_id, page="main")
+        except CircuitOpenError:
+            raise
         except Exception:
             pass
     release_date = datetime(release_year, 1, 1).isoformat() if release_year else None
 
     return {
+        "imdbId": imdb_id,
         "title": title,
         "releaseDate": release_date,
         "description": description,
@@ -382,64 +1559,469 @@ def search_title(query):
         
     return search_results
 
-def import_star_trek_data():
+# Local title search (index / search subcommands). Titles and aliases are normalized (ASCII,
+# lower case, punctuation dropped) and indexed by character trigrams; a query is scored by the
+# share of its trigrams a name contains, with a bonus for exact, prefix and word-prefix matches.
+SEARCH_INDEX_PATH = os.path.join(DATA_DIR, 'search_index.json')
+SEARCH_INDEX_VERSION = 1
+SEARCH_NGRAM = 3
+SEARCH_MIN_SCORE = 0.5      # share of the query's trigrams a name must contain to be returned
+DEFAULT_SEARCH_LIMIT = 10
+DEFAULT_DATASET_FILTER = "star trek"
+SEARCH_KIND_RANK = {'tv series': 0, 'movie': 0, 'episode': 2}  # ties go to titles over episodes
+
+def normalize_title(text):
+    """ASCII, lower case, '&' spelled out, runs of anything else collapsed to one space."""
+    text = unicodedata.normalize('NFKD', str(text or '')).encode('ascii', 'ignore').decode('ascii').lower()
+    return ' '.join(re.findall(r'[a-z0-9]+', text.replace('&', ' and ')))
+
+def title_ngrams(normalized):
+    padded = f" {normalized} "
+    return {padded[i:i + SEARCH_NGRAM] for i in range(max(1, len(padded) - SEARCH_NGRAM + 1))}
+
+def dataset_kind(title_type):
     """
-    Import Star Trek TV series and movies data and write to JSON files.
+    title.basics titleType -> search entry kind: split into lower-case words ('tvSeries' ->
+    'tv series'), except 'tvEpisode', which is 'episode' like the catalog's own episodes.
     """
-    tv_series = {
-        "Star Trek: The Original Series": {"imdb_id": "tt0060028", "order": 1},
-        "Star Trek: The Animated Series": {"imdb_id": "tt0069637", "order": 2},
-        "Star Trek: The Next Generation": {"imdb_id": "tt0092455", "order": 9},
-        "Star Trek: Deep Space Nine": {"imdb_id": "tt0106145", "order": 11},
-        "Star Trek: Voyager": {"imdb_id": "tt0112178", "order": 12},
-        "Star Trek: Enterprise": {"imdb_id": "tt0244365", "order": 16},
-        "Star Trek: Discovery": {"imdb_id": "tt5171438", "order": 20},
-        "Star Trek: Short Treks": {"imdb_id": "tt9059594", "order": 21},
-        "Star Trek: Picard": {"imdb_id": "tt8806524", "order": 22},
-        "Star Trek: Lower Decks": {"imdb_id": "tt9184820", "order": 23},
-        "Star Trek: Prodigy": {"imdb_id": "tt9795876", "order": 24},
-        "Star Trek: Strange New Worlds": {"imdb_id": "tt12327578", "order": 25},
-    }
-    
-    tv_data = []
-    for series_name, info in tv_series.items():
-        print(f"Importing TV series: {series_name}")
+    if title_type == 'tvEpisode':
+        return 'episode'
+    return re.sub(r'(?<!^)([A-Z])', r' \1', title_type or '').lower() or 'unknown'
+
+def catalog_search_entries(tv_data, movie_data):
+    """Search entries for the imported shows, their episodes and the movies."""
+    entries = []
+    for name, info in TV_SERIES.items():
+        series = find_previous(tv_data, info, lambda r: r.get('show'))
+        show = (series or {}).get('show') or {}
+        seasons = (series or {}).get('seasons') or []
+        years = [air_year(ep.get('airDate')) for season in seasons for ep in season.get('episodes') or []]
+        years = [y for y in years if y]
+        title = show.get('title') or name
+        entries.append({'title': title, 'year': min(years) if years else None, 'kind': 'tv series',
+                        'imdbId': info['imdb_id'], 'aliases': [name, *info.get('aliases', ())]})
+        for season in seasons:
+            for ep in season.get('episodes') or []:
+                if ep.get('title'):
+                    entries.append({'title': ep['title'], 'year': air_year(ep.get('airDate')), 'kind': 'episode',
+                                    'imdbId': ep.get('imdbId'), 'show': title, 'season': season['number'],
+                                    'episode': ep.get('episodeNumber')})
+    for name, info in MOVIES.items():
+        movie = find_previous(movie_data, info) or {}
+        entries.append({'title': movie.get('title') or name, 'year': air_year(movie.get('releaseDate')),
+                        'kind': 'movie', 'imdbId': info['imdb_id'], 'aliases': [name]})
+    return entries
+
+def dataset_search_entries(path, match=DEFAULT_DATASET_FILTER):
+    """
+    Search entries for the title.basics rows whose primary or original title contains `match`
+    (normalized; empty = every title). Adult titles are skipped.
+    """
+    needle = normalize_title(match)
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rt', encoding='utf-8', newline='') as f:
+        header = next(f).rstrip('\n').split('\t')
+        col = {name: i for i, name in enumerate(header)}
+        for line in f:
+            fields = line.rstrip('\n').split('\t')
+            if len(fields) < len(header) or fields[col['isAdult']] == '1':
+                continue
+            primary, original = fields[col['primaryTitle']], fields[col['originalTitle']]
+            if needle and needle not in normalize_title(primary) and needle not in normalize_title(original):
+                continue
+            year = fields[col['startYear']]
+            yield {'title': primary, 'year': int(year) if year.isdigit() else None,
+                   'kind': dataset_kind(fields[col['titleType']]), 'imdbId': fields[col['tconst']],
+                   'aliases': [original] if original != primary else []}
+
+class SearchIndex:
+    """
+    Trigram index over search entries ({title, year, kind, imdbId, aliases, ...}). Every title
+    and alias is a separate name pointing at its entry; postings map a trigram to name numbers.
+    The index file stores all three, so loading it is a single json.load.
+    """
+    def __init__(self, entries, names=None, postings=None):
+        self.entries = entries
+        if names is None:
+            names, postings = [], {}
+            for number, entry in enumerate(entries):
+                for text in dict.fromkeys([entry['title'], *entry.get('aliases', ())]):
+                    normalized = normalize_title(text)
+                    if not normalized:
+                        continue
+                    for gram in title_ngrams(normalized):
+                        postings.setdefault(gram, []).append(len(names))
+                    names.append([number, normalized])
+        self.names = names
+        self.postings = postings
+
+    @classmethod
+    def build(cls, entries):
+        """Index entries, merging duplicates by imdbId (the first one wins, later aliases are kept)."""
+        merged, by_id = [], {}
+        for entry in entries:
+            known = by_id.get(entry.get('imdbId')) if entry.get('imdbId') else None
+            if known is None:
+                entry = dict(entry, aliases=list(entry.get('aliases', ())))
+                merged.append(entry)
+                if entry.get('imdbId'):
+                    by_id[entry['imdbId']] = entry
+                continue
+            for alias in [entry['title'], *entry.get('aliases', ())]:
+                if alias != known['title'] and alias not in known['aliases']:
+                    known['aliases'].append(alias)
+        return cls(merged)
+
+    @classmethod
+    def load(cls, path=SEARCH_INDEX_PATH):
+        with open(path) as f:
+            data = json.load(f)
+        if data.get('version') != SEARCH_INDEX_VERSION:
+            raise ValueError(f"{path} is not a version {SEARCH_INDEX_VERSION} search index; rebuild it with `index`")
+        return cls(data['entries'], data['names'], data['postings'])
+
+    def save(self, path=SEARCH_INDEX_PATH):
+        data = {'version': SEARCH_INDEX_VERSION, 'entries': self.entries, 'names': self.names, 'postings': self.postings}
+        write_atomic(path, json.dumps(data, separators=(',', ':')).encode('utf-8'))
+
+    def search(self, query, limit=DEFAULT_SEARCH_LIMIT, kind=None):
+        """Best matches for `query`, one per entry, in the search_title result format plus a score."""
+        normalized = normalize_title(query)
+        if not normalized:
+            return []
+        grams = title_ngrams(normalized)
+        shared = {}
+        for gram in grams:
+            for name in self.postings.get(gram, ()):
+                shared[name] = shared.get(name, 0) + 1
+        best = {}
+        for name, count in shared.items():
+            score = count / len(grams)
+            if score < SEARCH_MIN_SCORE:
+                continue
+            number, text = self.names[name]
+            if text == normalized:
+                score += 2
+            elif text.startswith(normalized):
+                score += 1
+            elif f" {normalized}" in f" {text}":
+                score += 0.5
+            if score > best.get(number, (0,))[0]:
+                best[number] = (score, len(text))
+        ranked = []
+        for number, (score, length) in best.items():
+            entry = self.entries[number]
+            if kind and entry['kind'] != kind:
+                continue
+            ranked.append((-score, SEARCH_KIND_RANK.get(entry['kind'], 1), length, entry.get('year') or 0, number))
+        ranked.sort()
+        return [dict({k: v for k, v in self.entries[number].items() if k != 'aliases'}, score=round(-neg, 3))
+                for neg, _, _, _, number in ranked[:limit]]
+
+def build_search_index(dataset=None, match=DEFAULT_DATASET_FILTER, path=SEARCH_INDEX_PATH):
+    """Index the current JSON files, plus matching title.basics rows if a dataset is given."""
+    started = time.monotonic()
+    tv_data, movie_data = load_previous_data()
+    entries = catalog_search_entries(tv_data, movie_data)
+    if dataset:
+        entries += dataset_search_entries(dataset, match)
+    index = SearchIndex.build(entries)
+    index.save(path)
+    log.info(f"Search index written to {path}: {len(index.entries)} titles, {len(index.names)} names "
+             f"in {time.monotonic() - started:.1f}s")
+    return index
+
+def answer_search(index, line):
+    """One search request: a plain query line, or {"query", "limit", "kind"} as JSON."""
+    line = line.strip()
+    request = {'query': line}
+    if line.startswith('{'):
         try:
-            result = fetch_show_and_episodes(info["imdb_id"], info["order"])
-            tv_data.append(result)
+            request = json.loads(line)
+        except ValueError as e:
+            return {'error': f"invalid request: {e}"}
+    limit = request.get('limit')
+    if limit is None:
+        limit = DEFAULT_SEARCH_LIMIT
+    elif isinstance(limit, bool) or not isinstance(limit, int) or limit < 1:
+        return {'error': f"invalid request: limit must be a positive integer, not {limit!r}"}
+    query = str(request.get('query') or '')
+    started = time.perf_counter()
+    results = index.search(query, limit=limit, kind=request.get('kind'))
+    return {'query': query, 'results': results, 'ms': round((time.perf_counter() - started) * 1000, 3)}
+
+def serve_search(index, stream_in, stream_out):
+    """Answer one request per input line with one JSON line until end of input."""
+    for line in stream_in:
+        if not line.strip():
+            continue
+        try:
+            answer = answer_search(index, line)
         except Exception as e:
-            print(f"Error importing {series_name}: {e}")
-    
-    movies = {
-        "Star Trek: The Motion Picture": {"imdb_id": "tt0079945", "order": 3},
-        "Star Trek II: The Wrath of Khan": {"imdb_id": "tt0084726", "order": 4},
-        "Star Trek III: The Search for Spock": {"imdb_id": "tt0088170", "order": 5},
-        "Star Trek IV: The Voyage Home": {"imdb_id": "tt0092007", "order": 6},
-        "Star Trek V: The Final Frontier": {"imdb_id": "tt0098382", "order": 7},
-        "Star Trek VI: The Undiscovered Country": {"imdb_id": "tt0102975", "order": 8},
-        "Star Trek: Generations": {"imdb_id": "tt0111280", "order": 10},
-        "Star Trek: First Contact": {"imdb_id": "tt0117731", "order": 13},
-        "Star Trek: Insurrection": {"imdb_id": "tt0120844", "order": 14},
-        "Star Trek: Nemesis": {"imdb_id": "tt0253754", "order": 15},
-        "Star Trek (2009)": {"imdb_id": "tt0796366", "order": 17},
-        "Star Trek Into Darkness": {"imdb_id": "tt1408101", "order": 18},
-        "Star Trek Beyond": {"imdb_id": "tt2660888", "order": 19},
-        "Star Trek: Section 31": {"imdb_id": "tt9603060", "order": 26},
-    }
-    
-    movie_data = []
-    for movie_title, info in movies.items():
-        print(f"Importing movie: {movie_title}")
+            log.error(f"Search request failed: {e}")
+            answer = {'error': f"{type(e).__name__}: {e}"}
+        stream_out.write(json.dumps(answer) + '\n')
+        stream_out.flush()
+
+def serve_search_socket(index, path):
+    """Serve the same line protocol on a Unix socket, one thread per connection."""
+    import socketserver
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            serve_search(index, io.TextIOWrapper(self.rfile, encoding='utf-8'),
+                         io.TextIOWrapper(self.wfile, encoding='utf-8', write_through=True))
+
+    if os.path.exists(path):
+        os.remove(path)
+    with socketserver.ThreadingUnixStreamServer(path, Handler) as server:
+        log.info(f"Serving title search on {path}")
         try:
-            result = fetch_movie(info["imdb_id"], info["order"])
-            if result:
-                movie_data.append(result)
+            server.serve_forever()
+        finally:
+            os.remove(path)
+
+TV_SERIES = {
+    "Star Trek: The Original Series": {"imdb_id": "tt0060028", "order": 1, "aliases": ["TOS"]},
+    "Star Trek: The Animated Series": {"imdb_id": "tt0069637", "order": 2, "aliases": ["TAS"]},
+    "Star Trek: The Next Generation": {"imdb_id": "tt0092455", "order": 9, "aliases": ["TNG"]},
+    "Star Trek: Deep Space Nine": {"imdb_id": "tt0106145", "order": 11, "aliases": ["DS9"]},
+    "Star Trek: Voyager": {"imdb_id": "tt0112178", "order": 12, "aliases": ["VOY"]},
+    "Star Trek: Enterprise": {"imdb_id": "tt0244365", "order": 16, "aliases": ["ENT"]},
+    "Star Trek: Discovery": {"imdb_id": "tt5171438", "order": 20, "aliases": ["DIS"]},
+    "Star Trek: Short Treks": {"imdb_id": "tt9059594", "order": 21},
+    "Star Trek: Picard": {"imdb_id": "tt8806524", "order": 22, "aliases": ["PIC"]},
+    "Star Trek: Lower Decks": {"imdb_id": "tt9184820", "order": 23, "aliases": ["LD"]},
+    "Star Trek: Prodigy": {"imdb_id": "tt9795876", "order": 24, "aliases": ["PRO"]},
+    "Star Trek: Strange New Worlds": {"imdb_id": "tt12327578", "order": 25, "aliases": ["SNW"], "airing": True},
+}
+
+MOVIES = {
+    "Star Trek: The Motion Picture": {"imdb_id": "tt0079945", "order": 3},
+    "Star Trek II: The Wrath of Khan": {"imdb_id": "tt0084726", "order": 4},
+    "Star Trek III: The Search for Spock": {"imdb_id": "tt0088170", "order": 5},
+    "Star Trek IV: The Voyage Home": {"imdb_id": "tt0092007", "order": 6},
+    "Star Trek V: The Final Frontier": {"imdb_id": "tt0098382", "order": 7},
+    "Star Trek VI: The Undiscovered Country": {"imdb_id": "tt0102975", "order": 8},
+    "Star Trek: Generations": {"imdb_id": "tt0111280", "order": 10},
+    "Star Trek: First Contact": {"imdb_id": "tt0117731", "order": 13},
+    "Star Trek: Insurrection": {"imdb_id": "tt0120844", "order": 14},
+    "Star Trek: Nemesis": {"imdb_id": "tt0253754", "order": 15},
+    "Star Trek (2009)": {"imdb_id": "tt0796366", "order": 17},
+    "Star Trek Into Darkness": {"imdb_id": "tt1408101", "order": 18},
+    "Star Trek Beyond": {"imdb_id": "tt2660888", "order": 19},
+    "Star Trek: Section 31": {"imdb_id": "tt9603060", "order": 26},
+}
+
+def series_fallback(series_name, previous, done):
+    """A failed series' stand-in: its previous record plus the seasons fetched this run, if it has one."""
+    fallback = merge_seasons(previous, done) if done else previous
+    if not (fallback and fallback.get('show')):
+        fallback = None
+    failed_titles.append((series_name, fallback is not None))
+    return fallback
+
+def import_series(series_name, info, previous=None, done=None):
+    log.info(f"Importing TV series: {series_name}")
+    started = time.monotonic()
+    result = None
+    try:
+        result = fetch_show_and_episodes(info["imdb_id"], info["order"], previous=previous, done=done)
+        if not result.get('show'):
+            # Series page could not be loaded: keep the existing record as it was
+            return series_fallback(series_name, previous, done)
+        return result
+    except CircuitOpenError:
+        raise
+    except Exception as e:
+        log.error(f"Error importing {series_name}: {e}")
+        return series_fallback(series_name, previous, done)
+    finally:
+        ok = bool(result and result.get('show'))
+        metrics.record_title('series', info["imdb_id"], series_name, time.monotonic() - started, ok)
+        page_memo.release([info["imdb_id"]])
+
+def import_movie(movie_title, info, previous=None):
+    log.info(f"Importing movie: {movie_title}")
+    started = time.monotonic()
+    result = None
+    try:
+        result = fetch_movie(info["imdb_id"], info["order"])
+        if result:
+            checkpoint('movie', imdbId=info["imdb_id"], movie=result)
+            emit_record('movie', result)
+            return result
+        failed_titles.append((movie_title, previous is not None))
+        return previous
+    except CircuitOpenError:
+        raise
+    except Exception as e:
+        log.error(f"Error importing movie {movie_title}: {e}")
+        failed_titles.append((movie_title, previous is not None))
+        return previous
+    finally:
+        metrics.record_title('movie', info["imdb_id"], movie_title, time.monotonic() - started, bool(result))
+        page_memo.release([info["imdb_id"]])
+
+def streamed(import_title):
+    """
+    import_series / import_movie for streaming mode: the records are already written, so the
+    worker returns only whether the title produced one and its data is freed right away.
+    """
+    def run(*args, **kwargs):
+        return import_title(*args, **kwargs) is not None
+    return run
+
+def load_previous_data(output_dir=DATA_DIR):
+    """Load the last written (tv_data, movie_data); missing or unreadable files load as []."""
+    loaded = []
+    for filename in ('tv_series_data.json', 'movies_data.json'):
+        try:
+            with open(os.path.join(output_dir, filename)) as f:
+                loaded.append(json.load(f))
+        except FileNotFoundError:
+            loaded.append([])
         except Exception as e:
-            print(f"Error importing movie {movie_title}: {e}")
+            log.warning(f"Error reading previous {filename}: {e}. Treating as empty.")
+            loaded.append([])
+    return loaded[0], loaded[1]
+
+def find_previous(records, info, meta_of=lambda r: r):
+    """
+    Find a title's record from an earlier import. Matches on imdbId, falling back to
+    "order" for files written before imdbId was recorded.
+    """
+    for record in records:
+        meta = meta_of(record) or {}
+        if meta.get('imdbId') == info['imdb_id']:
+            return record
+        if meta.get('imdbId') is None and meta.get('order') == info['order']:
+            return record
+    return None
+
+def series_is_complete(info, previous):
+    """An ended series whose earlier import has no seasons left to refresh needs no refetch."""
+    if not previous or not previous.get('show') or not previous.get('seasons') or info.get('airing'):
+        return False
+    return not any(season_needs_refresh(s) for s in previous['seasons'])
+
+def movie_is_complete(previous):
+    return bool(previous) and all(previous.get(k) is not None for k in ('releaseDate', 'imdbRating', 'runtime'))
+
+def resolve(item):
+    return item.result() if isinstance(item, Future) else item
+
+def import_star_trek_data(workers=DEFAULT_WORKERS, incremental=False, ndjson_stream=None, resume=False,
+                          allow_partial=False):
+    """
+    Import Star Trek TV series and movies data and write to JSON files.
+    Titles are fetched on a pool of `workers` threads (1 = sequential); output order
+    always follows TV_SERIES / MOVIES regardless of completion order.
+
+    With `incremental`, the previous JSON files are loaded, complete titles are carried
+    over without fetching, and series only refetch the seasons that can have changed.
+
+    With `ndjson_stream`, records are streamed to it as NDJSON as soon as they are fetched
+    (show, season, episode and movie records) instead of being collected in memory and
+    written to the JSON files at the end. Each title's data is then freed when it finishes.
+
+    Every completed season, series and movie is recorded in the checkpoint journal. With
+    `resume`, the journal of an interrupted run is replayed and only the remaining work is
+    fetched. A title that fails keeps its record from the previous import, if there is one.
+    If a title without one fails, the JSON files are left as they were, the journal is kept
+    and ImportIncompleteError is raised; with `allow_partial` the output is written without
+    that title instead (the journal is still kept, so --resume retries only what is missing).
+    """
+    global record_writer, checkpoint_writer
+    workers = max(1, int(workers or 1))
+    keep = ndjson_stream is None
+    run_series = import_series if keep else streamed(import_series)
+    run_movie = import_movie if keep else streamed(import_movie)
+    del failed_titles[:]
+    page_memo.clear()
+    prev_tv, prev_movies = load_previous_data() if incremental else ([], [])
+    journal = load_checkpoint(CHECKPOINT_PATH) if resume else None
+    if resume and journal is None:
+        log.warning("No checkpoint journal found; running a full import.")
+    os.makedirs(os.path.dirname(CHECKPOINT_PATH), exist_ok=True)
+    checkpoint_writer = NdjsonWriter(open(CHECKPOINT_PATH, 'a' if journal else 'w'))
+    if ndjson_stream is not None:
+        record_writer = NdjsonWriter(ndjson_stream)
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            # Submit everything up front so series and movies share the pool.
+            # Complete titles are carried over as-is instead of being submitted.
+            series_results = []
+            for name, info in TV_SERIES.items():
+                previous = find_previous(prev_tv, info, lambda r: r.get('show'))
+                done_seasons = journal['seasons'].get(info['imdb_id'], {}) if journal else {}
+                if journal and info['imdb_id'] in journal['shows']:
+                    log.info(f"Resuming: TV series already imported: {name}")
+                    record = merge_seasons(previous, done_seasons)
+                    record['show'] = journal['shows'][info['imdb_id']]
+                    emit_series(record)
+                    if keep:
+                        series_results.append(record)
+                elif done_seasons:
+                    series_results.append(pool.submit(run_series, name, info, previous, done_seasons))
+                elif series_is_complete(info, previous):
+                    log.info(f"Skipping complete TV series: {name}")
+                    emit_series(previous)
+                    if keep:
+                        series_results.append(previous)
+                else:
+                    series_results.append(pool.submit(run_series, name, info, previous))
+            movie_results = []
+            for name, info in MOVIES.items():
+                previous = find_previous(prev_movies, info)
+                if journal and info['imdb_id'] in journal['movies']:
+                    log.info(f"Resuming: movie already imported: {name}")
+                    emit_record('movie', journal['movies'][info['imdb_id']])
+                    if keep:
+                        movie_results.append(journal['movies'][info['imdb_id']])
+                elif movie_is_complete(previous):
+                    log.info(f"Skipping complete movie: {name}")
+                    emit_record('movie', previous)
+                    if keep:
+                        movie_results.append(previous)
+                else:
+                    movie_results.append(pool.submit(run_movie, name, info, previous))
+            if not keep:
+                # Streaming: only the futures' status flags are left; raise the first error
+                for future in as_completed(series_results + movie_results):
+                    future.result()
+                series_results, movie_results = [], []
+            tv_data = [r for r in map(resolve, series_results) if r is not None]
+            movie_data = [r for r in map(resolve, movie_results) if r]
+    finally:
+        page_memo.clear()
+        if record_writer is not None:
+            record_writer.close()
+            record_writer = None
+        checkpoint_writer.close()
+        checkpoint_writer.stream.close()
+        checkpoint_writer = None
+        # Wait for the artwork still downloading and save the manifest, also when the run failed,
+        # so files already on disk are reused next time
+        image_downloader.close()
+    tv_data = resolve_artwork(tv_data)
+    movie_data = resolve_artwork(movie_data)
+    kept = [name for name, has_record in failed_titles if has_record]
+    missing = [name for name, has_record in failed_titles if not has_record]
+    if kept:
+        log.warning(f"{len(kept)} title(s) did not complete and keep their previous record: {', '.join(kept)}")
+    if missing and not allow_partial:
+        raise ImportIncompleteError(f"{len(missing)} title(s) did not complete: {', '.join(missing)}")
+    if missing:
+        log.warning(f"{len(missing)} title(s) did not complete and are left out: {', '.join(missing)}")
+
+    if ndjson_stream is not None:
+        finish_import(missing)
+        log.info("Star Trek data import complete. Records streamed as NDJSON.")
+        return
     
     # Write data to JSON files
-    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    output_dir = os.path.join(project_root, 'scripts', 'data')
+    output_dir = DATA_DIR
     os.makedirs(output_dir, exist_ok=True)
     
     with open(os.path.join(output_dir, 'tv_series_data.json'), 'w') as f:
@@ -447,25 +2029,969 @@ def import_star_trek_data():
         
     with open(os.path.join(output_dir, 'movies_data.json'), 'w') as f:
         json.dump(movie_data, f, indent=2)
-    
-    print("Star Trek data import complete. Data written to JSON files.")
+
+    rows = catalog_rows(tv_data, movie_data)
+    try:
+        write_catalog_snapshot(rows, SNAPSHOT_PATH, PREVIOUS_SNAPSHOT_PATH)
+    except Exception as e:
+        log.error(f"Error writing catalog snapshot: {e}")
+    try:
+        write_catalog_stats(rows, STATS_PATH)
+    except Exception as e:
+        log.error(f"Error writing catalog stats: {e}")
+
+    finish_import(missing)
+    log.info("Star Trek data import complete. Data written to JSON files.")
+
+def finish_import(missing):
+    """Remove the checkpoint journal, unless titles are missing and --resume should retry them."""
+    if missing:
+        log.warning(f"Checkpoint journal kept: rerun with --resume to retry {len(missing)} missing title(s).")
+    else:
+        os.remove(CHECKPOINT_PATH)
+
+# Direct database load (load subcommand): COPY into staging tables, then set-based upserts.
+# Table DDL lives in schema.sql, which ensureSchema() in import-imdb-data.js applies as well.
+SCHEMA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'schema.sql')
+
+def schema_sql(path=SCHEMA_PATH):
+    with open(path) as f:
+        return f.read()
+
+# (staging table, column definitions); `seq` keeps input order so the last record for a key wins
+STAGING_TABLES = {
+    'shows': ('stage_shows', [
+        ('seq', 'INTEGER'), ('title', 'TEXT'), ('description', 'TEXT'), ('"order"', 'INTEGER'),
+        ('artwork_url', 'TEXT'), ('imdb_rating', 'REAL'), ('runtime', 'INTEGER'),
+    ]),
+    'seasons': ('stage_seasons', [
+        ('seq', 'INTEGER'), ('show_title', 'TEXT'), ('number', 'INTEGER'),
+        ('imdb_rating', 'REAL'), ('runtime', 'INTEGER'),
+    ]),
+    'episodes': ('stage_episodes', [
+        ('seq', 'INTEGER'), ('show_title', 'TEXT'), ('season_number', 'INTEGER'), ('title', 'TEXT'),
+        ('episode_number', 'INTEGER'), ('air_date', 'TIMESTAMPTZ'), ('artwork_url', 'TEXT'),
+        ('imdb_rating', 'REAL'), ('description', 'TEXT'), ('runtime', 'INTEGER'),
+    ]),
+    'movies': ('stage_movies', [
+        ('seq', 'INTEGER'), ('title', 'TEXT'), ('release_date', 'TIMESTAMPTZ'), ('description', 'TEXT'),
+        ('"order"', 'INTEGER'), ('artwork_url', 'TEXT'), ('imdb_rating', 'REAL'), ('runtime', 'INTEGER'),
+    ]),
+}
+
+# Same column updates as the row-by-row upserts in import-imdb-data.js
+MERGE_SQL = [
+    ('shows', """
+        INSERT INTO shows (title, description, "order", artwork_url, imdb_rating, runtime)
+        SELECT DISTINCT ON (title) title, description, "order", artwork_url, imdb_rating, runtime
+        FROM stage_shows ORDER BY title, seq DESC
+        ON CONFLICT (title) DO UPDATE SET
+          description = EXCLUDED.description,
+          "order" = EXCLUDED."order",
+          artwork_url = EXCLUDED.artwork_url,
+          imdb_rating = EXCLUDED.imdb_rating,
+          runtime = EXCLUDED.runtime
+    """),
+    ('seasons', """
+        INSERT INTO seasons (number, show_id, imdb_rating, runtime)
+        SELECT DISTINCT ON (sh.id, s.number) s.number, sh.id, s.imdb_rating, s.runtime
+        FROM stage_seasons s JOIN shows sh ON sh.title = s.show_title
+        ORDER BY sh.id, s.number, s.seq DESC
+        ON CONFLICT (show_id, number) DO UPDATE SET
+          imdb_rating = EXCLUDED.imdb_rating,
+          runtime = EXCLUDED.runtime
+    """),
+    ('episodes', """
+        INSERT INTO episodes (title, episode_number, season_id, air_date, artwork_url, imdb_rating, description, runtime)
+        SELECT DISTINCT ON (se.id, e.episode_number)
+          e.title, e.episode_number, se.id, e.air_date, e.artwork_url, e.imdb_rating, e.description, e.runtime
+        FROM stage_episodes e
+        JOIN shows sh ON sh.title = e.show_title
+        JOIN seasons se ON se.show_id = sh.id AND se.number = e.season_number
+        ORDER BY se.id, e.episode_number, e.seq DESC
+        ON CONFLICT (season_id, episode_number) DO UPDATE SET
+          title = EXCLUDED.title,
+          air_date = EXCLUDED.air_date,
+          artwork_url = EXCLUDED.artwork_url,
+          imdb_rating = EXCLUDED.imdb_rating,
+          description = EXCLUDED.description,
+          runtime = EXCLUDED.runtime
+    """),
+    ('movies', """
+        INSERT INTO movies (title, release_date, description, "order", artwork_url, imdb_rating, runtime)
+        SELECT DISTINCT ON (title) title, release_date, description, "order", artwork_url, imdb_rating, runtime
+        FROM stage_movies ORDER BY title, seq DESC
+        ON CONFLICT (title) DO UPDATE SET
+          release_date = EXCLUDED.release_date,
+          description = EXCLUDED.description,
+          "order" = EXCLUDED."order",
+          artwork_url = EXCLUDED.artwork_url,
+          imdb_rating = EXCLUDED.imdb_rating,
+          runtime = EXCLUDED.runtime
+    """),
+]
+
+def parse_episode_number(value):
+    try:
+        return int(str(value).strip())
+    except (TypeError, ValueError):
+        return None
+
+def episode_row(show_title, season_number, ep):
+    """Staging row for an episode, or None if it has no usable episode number."""
+    number = parse_episode_number(ep.get('episodeNumber'))
+    if number is None:
+        log.warning(f"Skipping episode without a number: {show_title} S{season_number} {ep.get('title')!r}")
+        return None
+    title = ep.get('title') if ep.get('title') and str(ep.get('title')).strip() else f"Episode {number}"
+    return [show_title, season_number, title, number, ep.get('airDate'), ep.get('artworkUrl'),
+            ep.get('imdbRating'), ep.get('description'), ep.get('runtime')]
+
+def movie_row(movie):
+    return [movie.get('title'), movie.get('releaseDate'), movie.get('description'), movie.get('order'),
+            movie.get('artworkUrl'), movie.get('imdbRating'), movie.get('runtime')]
+
+def show_row(show):
+    return [show.get('title'), show.get('description'), show.get('order'), show.get('artworkUrl'),
+            show.get('imdbRating'), show.get('runtime')]
+
+def catalog_rows(tv_data, movie_data):
+    """Flatten the nested JSON import output into staging rows per table."""
+    rows = {'shows': [], 'seasons': [], 'episodes': [], 'movies': []}
+    for series in tv_data:
+        show = series.get('show')
+        if not show:
+            continue
+        rows['shows'].append(show_row(show))
+        for season in series.get('seasons') or []:
+            rows['seasons'].append([show['title'], season['number'], season.get('imdbRating'), season.get('runtime')])
+            for ep in season.get('episodes') or []:
+                row = episode_row(show['title'], season['number'], ep)
+                if row:
+                    rows['episodes'].append(row)
+    rows['movies'] = [movie_row(m) for m in movie_data if m and m.get('title')]
+    return rows
+
+def ndjson_catalog_rows(path):
+    """Staging rows from an `import --ndjson` stream. Later records for the same key win."""
+    rows = {'shows': [], 'seasons': [], 'episodes': [], 'movies': []}
+    show_titles = {}
+    with open(path) as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # torn last line of an interrupted import
+            kind = record.get('type')
+            if kind == 'show':
+                show_titles[record.get('imdbId')] = record['title']
+                rows['shows'].append(show_row(record))
+            elif kind == 'season' and record.get('showImdbId') in show_titles:
+                rows['seasons'].append([show_titles[record['showImdbId']], record['number'],
+                                        record.get('imdbRating'), record.get('runtime')])
+            elif kind == 'episode' and record.get('showImdbId') in show_titles:
+                row = episode_row(show_titles[record['showImdbId']], record['seasonNumber'], record)
+                if row:
+                    rows['episodes'].append(row)
+            elif kind == 'movie' and record.get('title'):
+                rows['movies'].append(movie_row(record))
+    return rows
+
+def copy_text_value(value):
+    """Encode one value for COPY ... FROM STDIN (text format)."""
+    if value is None:
+        return '\\N'
+    return (str(value).replace('\\', '\\\\').replace('\t', '\\t')
+            .replace('\n', '\\n').replace('\r', '\\r'))
+
+def connect_database(database_url):
+    """psycopg2 connection (imported here, so the other commands run without it)."""
+    try:
+        import psycopg2
+    except ImportError:
+        raise RuntimeError("Database commands need psycopg2 (pip install psycopg2-binary)")
+    return psycopg2.connect(database_url)
+
+def load_catalog(rows, database_url):
+    """
+    Load staging rows into Postgres in a single transaction: COPY each table's rows into a
+    temporary staging table, then merge with one INSERT ... ON CONFLICT per content table, then
+    recompute catalog_stats from the merged tables. Returns {table: rows inserted or updated}.
+    """
+    counts = {}
+    conn = connect_database(database_url)
+    try:
+        with conn:
+            with conn.cursor() as cur:
+                cur.execute(schema_sql())
+                for table, (stage, columns) in STAGING_TABLES.items():
+                    column_defs = ", ".join(f"{name} {type_}" for name, type_ in columns)
+                    cur.execute(f"CREATE TEMP TABLE {stage} ({column_defs}) ON COMMIT DROP")
+                    buf = io.StringIO()
+                    for seq, row in enumerate(rows[table]):
+                        buf.write("\t".join(copy_text_value(v) for v in [seq] + list(row)) + "\n")
+                    buf.seek(0)
+                    cur.copy_expert(f"COPY {stage} FROM STDIN", buf)
+                for table, sql in MERGE_SQL:
+                    cur.execute(sql)
+                    counts[table] = cur.rowcount
+                counts['catalog_stats'] = store_catalog_stats(cur)
+    finally:
+        conn.close()
+    return counts
+
+def load_to_database(database_url, ndjson_path=None, snapshot_path=None):
+    """
+    Load the importer output (JSON files, an NDJSON stream file, or a snapshot, which may be a
+    `diff --output` delta) straight into Postgres.
+    """
+    if snapshot_path:
+        _, tables = read_snapshot(snapshot_path)
+        rows = snapshot_rows(tables)
+    elif ndjson_path:
+        rows = ndjson_catalog_rows(ndjson_path)
+    else:
+        tv_data, movie_data = load_previous_data()
+        rows = catalog_rows(tv_data, movie_data)
+    log.info("Loading " + ", ".join(f"{len(v)} {k}" for k, v in rows.items()) + " rows...")
+    counts = load_catalog(rows, database_url)
+    log.info("Database load complete: " + ", ".join(f"{v} {k}" for k, v in counts.items()) + " upserted.")
+    return counts
+
+# Catalog aggregates for the statistics pages: computed from staging rows, written to
+# scripts/data/catalog_stats.json by import/stats. The catalog_stats table is rebuilt from the
+# merged content tables instead (DATABASE_ROWS_SQL), so after a delta load, or with rows the
+# import output no longer has, it still matches the statistics API's live queries.
+STATS_PATH = os.path.join(DATA_DIR, 'catalog_stats.json')
+ERAS = (  # (name, first year, last year); a title joins the era of its first air/release year
+    ('Original', 1966, 1986),
+    ('Next Generation', 1987, 2005),
+    ('Modern', 2006, None),
+)
+RATING_PERCENTILES = (10, 25, 50, 75, 90)
+
+def era_for(year):
+    for name, first, last in ERAS:
+        if year is not None and year >= first and (last is None or year <= last):
+            return name
+    return None
+
+def air_year(value):
+    """Year of an ISO date/timestamp string, or None."""
+    try:
+        return int(str(value)[:4])
+    except (TypeError, ValueError):
+        return None
+
+def rating_stats(ratings):
+    """Count, mean, min/max, percentiles and a 1-10 histogram (by whole point) of IMDb ratings."""
+    values = sorted(float(r) for r in ratings if r is not None)
+    histogram = {str(bucket): 0 for bucket in range(1, 11)}
+    for value in values:
+        histogram[str(min(10, max(1, int(value))))] += 1
+    stats = {
+        'count': len(values),
+        'mean': round(sum(values) / len(values), 2) if values else None,
+        'min': values[0] if values else None,
+        'max': values[-1] if values else None,
+    }
+    for pct in RATING_PERCENTILES:
+        stats[f'p{pct}'] = percentile(values, pct)
+    stats['histogram'] = histogram
+    return stats
+
+def rating_trend(points):
+    """
+    Mean rating per air year and the least-squares slope (rating points per year) over
+    (year, rating) pairs.
+    """
+    points = [(year, float(rating)) for year, rating in points if year is not None and rating is not None]
+    by_year = {}
+    for year, rating in points:
+        by_year.setdefault(year, []).append(rating)
+    slope = None
+    if len({year for year, _ in points}) > 1:
+        mean_x = sum(year for year, _ in points) / len(points)
+        mean_y = sum(rating for _, rating in points) / len(points)
+        sxx = sum((year - mean_x) ** 2 for year, _ in points)
+        slope = round(sum((year - mean_x) * (rating - mean_y) for year, rating in points) / sxx, 4)
+    return {
+        'slopePerYear': slope,
+        'byYear': [{'year': year, 'mean': round(sum(r) / len(r), 2), 'count': len(r)}
+                   for year, r in sorted(by_year.items())],
+    }
+
+def catalog_order(show_order, season_number, episode_number):
+    """Sort key used by the statistics API for episodes (movies use order * 10000)."""
+    return (show_order or 0) * 10000 + (season_number or 0) * 100 + (episode_number or 0)
+
+def aggregate_catalog(rows):
+    """
+    Per-show, per-season, per-era and catalog-wide stats from staging rows. Rows are deduplicated
+    on the same keys as the database merge (last one wins), so totals match what `load` writes.
+    """
+    shows = {row[0]: row for row in rows['shows']}
+    episodes = {(row[0], row[1], row[3]): row for row in rows['episodes']}
+    movies = {row[0]: row for row in rows['movies']}
+    season_rows = {(row[0], row[1]): row for row in rows['seasons']}
+
+    by_show = {}
+    for (show_title, season_number, number), row in sorted(episodes.items(), key=lambda item: item[0][1:]):
+        by_show.setdefault(show_title, {}).setdefault(season_number, []).append(row)
+
+    show_stats = []
+    era_members = {name: {'shows': [], 'movies': [], 'ratings': [], 'points': [], 'runtime': 0, 'episodes': 0}
+                   for name, _, _ in ERAS}
+    bands = []
+    for title, show in sorted(shows.items(), key=lambda item: (item[1][2] is None, item[1][2] or 0, item[0])):
+        order = show[2]
+        seasons = by_show.get(title, {})
+        all_eps = [ep for number in sorted(seasons) for ep in seasons[number]]
+        years = [air_year(ep[4]) for ep in all_eps if air_year(ep[4]) is not None]
+        era = era_for(min(years)) if years else None
+        runtime = sum(ep[8] or 0 for ep in all_eps)
+        season_stats = []
+        for number in sorted(seasons):
+            eps = seasons[number]
+            season_stats.append({
+                'number': number,
+                'episodes': len(eps),
+                'runtime': sum(ep[8] or 0 for ep in eps),
+                'imdbRating': (season_rows.get((title, number)) or [None] * 3)[2],
+                'rating': rating_stats(ep[6] for ep in eps),
+            })
+        show_stats.append({
+            'title': title,
+            'order': order,
+            'era': era,
+            'seasons': len(seasons),
+            'episodes': len(all_eps),
+            'runtime': runtime,
+            'rating': rating_stats(ep[6] for ep in all_eps),
+            'trend': rating_trend((air_year(ep[4]), ep[6]) for ep in all_eps),
+            'bySeason': season_stats,
+        })
+        if all_eps:
+            ords = [catalog_order(order, ep[1], ep[3]) for ep in all_eps]
+            bands.append({'title': title, 'start': min(ords), 'end': max(ords)})
+        if era:
+            member = era_members[era]
+            member['shows'].append(title)
+            member['ratings'].extend(ep[6] for ep in all_eps)
+            member['points'].extend((air_year(ep[4]), ep[6]) for ep in all_eps)
+            member['runtime'] += runtime
+            member['episodes'] += len(all_eps)
+
+    for title, movie in movies.items():
+        era = era_for(air_year(movie[1]))
+        if era:
+            member = era_members[era]
+            member['movies'].append(title)
+            member['ratings'].append(movie[5])
+            member['points'].append((air_year(movie[1]), movie[5]))
+            member['runtime'] += movie[6] or 0
+
+    episode_runtime = sum(ep[8] or 0 for ep in episodes.values())
+    movie_runtime = sum(m[6] or 0 for m in movies.values())
+    return {
+        'generatedAt': datetime.now().isoformat(timespec='seconds'),
+        'catalog': {
+            'shows': len(shows),
+            'episodes': len(episodes),
+            'movies': len(movies),
+            'episodeRuntime': episode_runtime,
+            'movieRuntime': movie_runtime,
+            'episodeRating': rating_stats(ep[6] for ep in episodes.values()),
+            'movieRating': rating_stats(m[5] for m in movies.values()),
+            'seriesBands': sorted(bands, key=lambda band: band['start']),
+            'movieOrders': sorted(m[3] * 10000 for m in movies.values() if m[3] is not None),
+        },
+        'shows': show_stats,
+        'eras': [{
+            'name': name,
+            'firstYear': first,
+            'lastYear': last,
+            'shows': era_members[name]['shows'],
+            'movies': era_members[name]['movies'],
+            'episodes': era_members[name]['episodes'],
+            'runtime': era_members[name]['runtime'],
+            'rating': rating_stats(era_members[name]['ratings']),
+            'trend': rating_trend(era_members[name]['points']),
+        } for name, first, last in ERAS],
+    }
+
+def stats_rows(stats):
+    """(scope, stats) rows for the catalog_stats table: 'catalog', 'show:<title>', 'era:<name>'."""
+    rows = [('catalog', stats['catalog'])]
+    rows += [(f"show:{show['title']}", show) for show in stats['shows']]
+    rows += [(f"era:{era['name']}", era) for era in stats['eras']]
+    return rows
+
+# The merged content tables read back as staging rows (the STAGING_TABLES columns without seq).
+# Ratings go through numeric so REAL values come back as written (8.4, not 8.399999618).
+DATABASE_ROWS_SQL = {
+    'shows': """SELECT title, description, "order", artwork_url, imdb_rating::numeric::float8, runtime
+                FROM shows ORDER BY title""",
+    'seasons': """SELECT sh.title, s.number, s.imdb_rating::numeric::float8, s.runtime
+                  FROM seasons s JOIN shows sh ON sh.id = s.show_id ORDER BY sh.title, s.number""",
+    'episodes': """SELECT sh.title, s.number, e.title, e.episode_number, e.air_date::text, e.artwork_url,
+                          e.imdb_rating::numeric::float8, e.description, e.runtime
+                   FROM episodes e JOIN seasons s ON s.id = e.season_id JOIN shows sh ON sh.id = s.show_id
+                   ORDER BY sh.title, s.number, e.episode_number""",
+    'movies': """SELECT title, release_date::text, description, "order", artwork_url, imdb_rating::numeric::float8, runtime
+                 FROM movies ORDER BY "order" NULLS LAST, title""",
+}
+
+def store_catalog_stats(cur):
+    """Replace the catalog_stats rows with aggregates of the content tables. Returns the row count."""
+    rows = {}
+    for table, sql in DATABASE_ROWS_SQL.items():
+        cur.execute(sql)
+        rows[table] = cur.fetchall()
+    scoped = stats_rows(aggregate_catalog(rows))
+    cur.execute("DELETE FROM catalog_stats")
+    cur.executemany("INSERT INTO catalog_stats (scope, stats) VALUES (%s, %s)",
+                    [(scope, json.dumps(value)) for scope, value in scoped])
+    return len(scoped)
+
+def refresh_database_stats(database_url):
+    """Rebuild catalog_stats from what is in the database (after row-by-row upserts)."""
+    conn = connect_database(database_url)
+    try:
+        with conn:
+            with conn.cursor() as cur:
+                cur.execute(schema_sql())
+                count = store_catalog_stats(cur)
+    finally:
+        conn.close()
+    log.info(f"catalog_stats rebuilt from the database: {count} rows")
+    return count
+
+def write_catalog_stats(rows, path=STATS_PATH):
+    """Aggregate staging rows and write the stats artifact."""
+    stats = aggregate_catalog(rows)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(stats, f, indent=2)
+    log.info(f"Catalog stats written to {path}")
+    return stats
+
+# Columnar catalog snapshot (written by import; read by diff and load --snapshot). Tables and
+# columns are the staging tables above. Layout: magic, uint32 header length, JSON header, then
+# per column a null mask (one byte per row) and its values: int64 / float64 arrays, or uint32
+# offsets into a UTF-8 blob for text. Arrays are in native byte order (a local artifact).
+SNAPSHOT_PATH = os.path.join(DATA_DIR, 'catalog.snapshot')
+PREVIOUS_SNAPSHOT_PATH = os.path.join(DATA_DIR, 'catalog.prev.snapshot')
+SNAPSHOT_MAGIC = b'STSNAP01'
+SNAPSHOT_TYPES = {'INTEGER': 'int', 'REAL': 'float', 'TEXT': 'str', 'TIMESTAMPTZ': 'str'}
+SNAPSHOT_KEYS = {
+    'shows': ('title',),
+    'seasons': ('show_title', 'number'),
+    'episodes': ('show_title', 'season_number', 'episode_number'),
+    'movies': ('title',),
+}
+
+def snapshot_columns(table):
+    """[(name, type)] of a snapshot table: its staging columns without seq."""
+    return [(name.strip('"'), SNAPSHOT_TYPES[type_]) for name, type_ in STAGING_TABLES[table][1] if name != 'seq']
+
+def encode_column(values, kind):
+    """Null mask and value buffers for one column."""
+    nulls = bytes(1 if v is None else 0 for v in values)
+    if kind == 'int':
+        return [nulls, array('q', (0 if v is None else int(v) for v in values)).tobytes()]
+    if kind == 'float':
+        return [nulls, array('d', (0.0 if v is None else float(v) for v in values)).tobytes()]
+    encoded = [b'' if v is None else str(v).encode('utf-8') for v in values]
+    offsets = array('I', [0])
+    for item in encoded:
+        offsets.append(offsets[-1] + len(item))
+    return [nulls, offsets.tobytes(), b''.join(encoded)]
+
+def decode_column(buffers, kind, count):
+    """Column values as a list (None for nulls) from its buffers."""
+    nulls = buffers[0]
+    if kind in ('int', 'float'):
+        values = array('q' if kind == 'int' else 'd')
+        values.frombytes(buffers[1])
+        values = values.tolist()
+    else:
+        offsets = array('I')
+        offsets.frombytes(buffers[1])
+        blob = buffers[2]
+        values = [blob[offsets[i]:offsets[i + 1]].decode('utf-8') for i in range(count)]
+    return [None if nulls[i] else values[i] for i in range(count)]
+
+def write_snapshot(path, rows, delta=False):
+    """
+    Write staging rows ({table: [row]}, as from catalog_rows) as a columnar snapshot. `delta`
+    marks a snapshot holding only changed rows (from diff).
+    """
+    header = {'createdAt': datetime.now().isoformat(timespec='seconds'), 'delta': delta, 'tables': {}}
+    chunks = []
+    offset = 0
+    for table in SNAPSHOT_KEYS:
+        table_rows = rows.get(table) or []
+        columns = []
+        for index, (name, kind) in enumerate(snapshot_columns(table)):
+            buffers = encode_column([row[index] for row in table_rows], kind)
+            columns.append({'name': name, 'type': kind, 'buffers': [[offset + sum(len(b) for b in buffers[:i]), len(b)]
+                                                                    for i, b in enumerate(buffers)]})
+            chunks.extend(buffers)
+            offset += sum(len(b) for b in buffers)
+        header['tables'][table] = {'rows': len(table_rows), 'columns': columns}
+    header_bytes = json.dumps(header).encode('utf-8')
+    write_atomic(path, SNAPSHOT_MAGIC + struct.pack('<I', len(header_bytes)) + header_bytes + b''.join(chunks))
+
+def read_snapshot(path):
+    """
+    Read a snapshot into (header, {table: {'rows': n, 'columns': {name: [values]}}}), columns in
+    table order.
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    if data[:len(SNAPSHOT_MAGIC)] != SNAPSHOT_MAGIC:
+        raise ValueError(f"{path} is not a catalog snapshot")
+    header_len, = struct.unpack_from('<I', data, len(SNAPSHOT_MAGIC))
+    start = len(SNAPSHOT_MAGIC) + 4
+    header = json.loads(data[start:start + header_len])
+    body = memoryview(data)[start + header_len:]
+    tables = {}
+    for table, meta in header['tables'].items():
+        columns = {}
+        for column in meta['columns']:
+            buffers = [bytes(body[offset:offset + length]) for offset, length in column['buffers']]
+            columns[column['name']] = decode_column(buffers, column['type'], meta['rows'])
+        tables[table] = {'rows': meta['rows'], 'columns': columns}
+    return header, tables
+
+def snapshot_rows(tables):
+    """Staging rows ({table: [row]}) from a read snapshot, for load_catalog."""
+    rows = {}
+    for table in STAGING_TABLES:
+        columns = tables.get(table, {}).get('columns', {})
+        names = [name for name, _ in snapshot_columns(table)]
+        rows[table] = [list(row) for row in zip(*(columns.get(name, []) for name in names))]
+    return rows
+
+def write_catalog_snapshot(rows, path=SNAPSHOT_PATH, previous_path=PREVIOUS_SNAPSHOT_PATH):
+    """Write this import's snapshot, keeping the last one as `previous_path` for `diff`."""
+    if os.path.exists(path):
+        os.replace(path, previous_path)
+    write_snapshot(path, rows)
+    log.info(f"Catalog snapshot written to {path}")
+
+def diff_snapshots(old, new):
+    """
+    Compare two read snapshots table by table. Rows are matched on SNAPSHOT_KEYS (the last row
+    wins for duplicate keys, as in the database merge), then compared one column at a time.
+    Returns {table: {'added': [j], 'changed': {j: [column]}, 'removed': count}} with row
+    indexes into `new`.
+    """
+    result = {}
+    for table, keys in SNAPSHOT_KEYS.items():
+        old_cols = old.get(table, {}).get('columns', {})
+        new_cols = new.get(table, {}).get('columns', {})
+        old_index = {key: i for i, key in enumerate(zip(*(old_cols.get(k, []) for k in keys)))}
+        new_index = {key: j for j, key in enumerate(zip(*(new_cols.get(k, []) for k in keys)))}
+        pairs = [(old_index[key], j) for key, j in new_index.items() if key in old_index]
+        changed = {}
+        for name, _ in snapshot_columns(table):
+            if name in keys:
+                continue
+            old_values = old_cols.get(name) or [None] * old.get(table, {}).get('rows', 0)
+            new_values = new_cols.get(name) or [None] * new.get(table, {}).get('rows', 0)
+            for j in [j for i, j in pairs if old_values[i] != new_values[j]]:
+                changed.setdefault(j, []).append(name)
+        result[table] = {
+            'added': sorted(j for key, j in new_index.items() if key not in old_index),
+            'changed': dict(sorted(changed.items())),
+            'removed': sum(1 for key in old_index if key not in new_index),
+        }
+    return result
+
+def diff_catalog(old_path, new_path, output=None, stream=None):
+    """
+    Emit the rows added or changed between two snapshots as NDJSON on `stream`
+    ({"table", "change", "row"[, "columns"]}), and optionally write them as a delta snapshot
+    that `load --snapshot` can apply. Returns {table: {'added', 'changed', 'removed'}} counts.
+    """
+    _, old = read_snapshot(old_path)
+    _, new = read_snapshot(new_path)
+    changes = diff_snapshots(old, new)
+    new_rows = snapshot_rows(new)
+    delta = {}
+    counts = {}
+    for table, change in changes.items():
+        names = [name for name, _ in snapshot_columns(table)]
+        indexes = sorted(change['added'] + list(change['changed']))
+        delta[table] = [new_rows[table][j] for j in indexes]
+        if stream is not None:
+            for j in indexes:
+                record = {'table': table, 'change': 'changed' if j in change['changed'] else 'added',
+                          'row': dict(zip(names, new_rows[table][j]))}
+                if j in change['changed']:
+                    record['columns'] = change['changed'][j]
+                stream.write(json.dumps(record) + "\n")
+        counts[table] = {'added': len(change['added']), 'changed': len(change['changed']), 'removed': change['removed']}
+    if output:
+        write_snapshot(output, delta, delta=True)
+    return counts
+
+# Persistent worker (worker subcommand) for import-imdb-data.js: JSON-RPC 2.0, one request per
+# stdin line and one response per stdout line. Calls run on a thread pool, so responses can arrive
+# out of order; match them by id. Logs go to stderr.
+RPC_PARSE_ERROR = -32700
+RPC_INVALID_REQUEST = -32600
+RPC_METHOD_NOT_FOUND = -32601
+RPC_INVALID_PARAMS = -32602
+RPC_SERVER_ERROR = -32000
+
+class Worker:
+    """
+    Long-lived helper process. The interpreter, the cinemagoerng import, the search index, the
+    response cache and the scheduler's per-host state stay warm between calls, so only the first
+    call pays for them. The page memo and the run metrics are cleared whenever no call is running.
+    """
+    def __init__(self, stream_in, stream_out, workers=DEFAULT_WORKERS, index_path=SEARCH_INDEX_PATH):
+        self.stream_in = stream_in
+        self.stream_out = stream_out
+        self.index_path = index_path
+        self.pool = ThreadPoolExecutor(max_workers=max(1, workers))
+        self.methods = {
+            'ping': self.ping,
+            'search': self.search,
+            'index': self.index,
+            'fetch_show': self.fetch_show,
+            'fetch_movie': self.fetch_movie,
+        }
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._active = 0
+        self._index = None
+        self._index_mtime = None
+
+    def serve(self):
+        """Answer requests until end of input or a `shutdown` call."""
+        for line in self.stream_in:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+            except ValueError as e:
+                self.respond(None, error=(RPC_PARSE_ERROR, f"parse error: {e}"))
+                continue
+            if not isinstance(request, dict) or not isinstance(request.get('method'), str):
+                self.respond(request.get('id') if isinstance(request, dict) else None,
+                             error=(RPC_INVALID_REQUEST, "invalid request"))
+                continue
+            if request['method'] == 'shutdown':
+                self.pool.shutdown(wait=True)
+                if 'id' in request:
+                    self.respond(request['id'], result=True)
+                return
+            with self._lock:
+                self._active += 1
+            self.pool.submit(self.dispatch, request)
+        self.pool.shutdown(wait=True)
+
+    def dispatch(self, request):
+        notify = 'id' not in request
+        params = request.get('params') or {}
+        method = self.methods.get(request['method'])
+        try:
+            if method is None:
+                self.respond(request.get('id'), error=(RPC_METHOD_NOT_FOUND, f"unknown method: {request['method']}"), notify=notify)
+                return
+            try:
+                if not isinstance(params, dict):
+                    raise TypeError("params must be an object")
+                inspect.signature(method).bind(**params)
+            except TypeError as e:
+                self.respond(request.get('id'), error=(RPC_INVALID_PARAMS, str(e)), notify=notify)
+                return
+            try:
+                result = method(**params)
+            except Exception as e:
+                log.error(f"Worker call {request['method']} failed: {e}")
+                self.respond(request.get('id'), error=(RPC_SERVER_ERROR, f"{type(e).__name__}: {e}"), notify=notify)
+            else:
+                self.respond(request.get('id'), result=result, notify=notify)
+        finally:
+            with self._lock:
+                self._active -= 1
+                if not self._active:
+                    # Idle: drop per-call state so a long-lived worker does not grow
+                    page_memo.clear()
+                    metrics.reset()
+
+    def respond(self, request_id, result=None, error=None, notify=False):
+        if notify:
+            return  # JSON-RPC notifications get no response
+        response = {'jsonrpc': '2.0', 'id': request_id}
+        if error:
+            response['error'] = {'code': error[0], 'message': error[1]}
+        else:
+            response['result'] = result
+        line = json.dumps(response) + '\n'
+        with self._write_lock:
+            self.stream_out.write(line)
+            self.stream_out.flush()
+
+    def search_index(self):
+        """The search index, reloaded when the file changes; None if it has not been built."""
+        with self._lock:
+            try:
+                mtime = os.path.getmtime(self.index_path)
+            except OSError:
+                self._index = self._index_mtime = None
+                return None
+            if mtime != self._index_mtime:
+                self._index = SearchIndex.load(self.index_path)
+                self._index_mtime = mtime
+            return self._index
+
+    def ping(self):
+        return {'pid': os.getpid()}
+
+    def search(self, query, limit=DEFAULT_SEARCH_LIMIT, kind=None, live=False):
+        index = None if live else self.search_index()
+        if index is None:
+            return search_title(query)
+        return index.search(query, limit=limit, kind=kind)
+
+    def index(self, dataset=None, match=DEFAULT_DATASET_FILTER):
+        index = build_search_index(dataset, match, self.index_path)
+        return {'titles': len(index.entries), 'names': len(index.names)}
+
+    def fetch_show(self, imdbId, order=None, maxSeasons=25):
+        order = order if order is not None else title_order(TV_SERIES, imdbId)
+        return resolve_artwork(fetch_show_and_episodes(imdbId, order, max_seasons=maxSeasons))
+
+    def fetch_movie(self, imdbId, order=None):
+        order = order if order is not None else title_order(MOVIES, imdbId)
+        return resolve_artwork(fetch_movie(imdbId, order))
+
+def title_order(titles, imdb_id):
+    """The configured viewing order of a TV_SERIES / MOVIES title, or None if it is not configured."""
+    return next((info['order'] for info in titles.values() if info['imdb_id'] == imdb_id), None)
 
 def main():
     import sys
-    if len(sys.argv) > 1:
-        if sys.argv[1] == 'search':
-            if len(sys.argv) > 2:
-                query = sys.argv[2]
-            else:
-                query = input("Enter a title to search on IMDb: ")
-            results = search_title(query)
+    import argparse
+    parser = argparse.ArgumentParser(description="Fetch Star Trek data from IMDb")
+    sub = parser.add_subparsers(dest='command')
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--log-level', default='INFO', choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'],
+                        help="logging verbosity on stderr (default INFO)")
+
+    p_search = sub.add_parser('search', parents=[common], help="Search for a title in the local index (or on IMDb)")
+    p_search.add_argument('query', nargs='?')
+    p_search.add_argument('--live', action='store_true',
+                          help="search IMDb online (needs IMDbPY) instead of the local index")
+    p_search.add_argument('--index', default=SEARCH_INDEX_PATH, metavar='PATH',
+                          help="search index built by `index` (default scripts/data/search_index.json)")
+    p_search.add_argument('--limit', type=int, default=DEFAULT_SEARCH_LIMIT,
+                          help=f"maximum results per query (default {DEFAULT_SEARCH_LIMIT})")
+    p_search.add_argument('--kind', help="only return this kind, e.g. 'tv series', 'movie' or 'episode'")
+    p_search.add_argument('--serve', action='store_true',
+                          help="keep the index loaded and answer queries from stdin, one per line, as JSON lines")
+    p_search.add_argument('--socket', metavar='PATH',
+                          help="with --serve, listen on this Unix socket instead of stdin/stdout")
+
+    p_index = sub.add_parser('index', parents=[common], help="Build the local title search index")
+    p_index.add_argument('--dataset', metavar='PATH',
+                         help="also index titles from an IMDb title.basics dataset (.tsv or .tsv.gz)")
+    p_index.add_argument('--match', default=DEFAULT_DATASET_FILTER, metavar='TEXT',
+                         help=f"only index dataset titles containing TEXT (default '{DEFAULT_DATASET_FILTER}'; '' = all)")
+    p_index.add_argument('--output', default=SEARCH_INDEX_PATH, metavar='PATH',
+                         help="index path (default scripts/data/search_index.json)")
+
+    # Options shared by the commands that fetch from IMDb (import, worker)
+    fetching = argparse.ArgumentParser(add_help=False)
+    fetching.add_argument('--fetch-workers', type=int, default=DEFAULT_FETCH_WORKERS,
+                          help=f"threads for season pages and episode detail lookups (default {DEFAULT_FETCH_WORKERS})")
+    fetching.add_argument('--cache-only', action='store_true',
+                          help="offline mode: serve every page from the response cache, never hit IMDb")
+    fetching.add_argument('--no-cache', action='store_true',
+                          help="bypass the response cache entirely")
+    fetching.add_argument('--image-workers', type=int, default=DEFAULT_IMAGE_WORKERS,
+                          help=f"parallel artwork downloads (default {DEFAULT_IMAGE_WORKERS})")
+    fetching.add_argument('--image-rate', type=float, default=IMAGE_REQUEST_INTERVAL,
+                          help=f"minimum seconds between requests to an artwork host (default {IMAGE_REQUEST_INTERVAL})")
+    fetching.add_argument('--rate', type=float, default=DEFAULT_REQUEST_INTERVAL,
+                          help=f"minimum seconds between requests to the same host (default {DEFAULT_REQUEST_INTERVAL}); "
+                               "stretched automatically while IMDb is throttling")
+    fetching.add_argument('--burst', type=int, default=DEFAULT_BURST,
+                          help=f"requests a host may get back to back before --rate spacing applies (default {DEFAULT_BURST})")
+    fetching.add_argument('--runtimes', default=TITLE_BASICS_PATH, metavar='PATH',
+                          help="IMDb title.basics dataset (.tsv or .tsv.gz) for bulk episode runtimes "
+                               "(default scripts/data/title.basics.tsv.gz, used if present)")
+
+    p_import = sub.add_parser('import', parents=[common, fetching], help="Import all Star Trek series and movies data")
+    p_import.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                          help=f"number of titles fetched concurrently (default {DEFAULT_WORKERS}, 1 = sequential)")
+    p_import.add_argument('--incremental', action='store_true',
+                          help="reuse the previous JSON output and only refetch changed or airing titles")
+    p_import.add_argument('--resume', action='store_true',
+                          help="continue an interrupted import from its checkpoint journal (pass the same flags again)")
+    p_import.add_argument('--allow-partial', action='store_true',
+                          help="write the output even if titles with no earlier record failed (they are left out)")
+    p_import.add_argument('--ndjson', nargs='?', const=DEFAULT_NDJSON_PATH, metavar='PATH',
+                          help="stream show/season/episode/movie records as NDJSON instead of writing the JSON "
+                               "files (default path scripts/data/catalog.ndjson; '-' = stdout, logs go to stderr)")
+    p_import.add_argument('--refresh', nargs='+', metavar='IMDB_ID', default=[],
+                          help="drop cached pages for these titles before importing")
+    p_import.add_argument('--report', default=DEFAULT_REPORT_PATH, metavar='PATH',
+                          help="where to write the JSON run report (default scripts/data/import_report.json)")
+
+    p_worker = sub.add_parser('worker', parents=[common, fetching],
+                              help="Answer JSON-RPC calls (search, index, fetch_show, fetch_movie) on stdin/stdout")
+    p_worker.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                          help=f"calls handled concurrently (default {DEFAULT_WORKERS})")
+    p_worker.add_argument('--index', default=SEARCH_INDEX_PATH, metavar='PATH',
+                          help="search index for `search` calls (default scripts/data/search_index.json)")
+
+    p_load = sub.add_parser('load', parents=[common], help="Bulk-load the imported data straight into Postgres")
+    p_load.add_argument('--database-url', default=os.environ.get('DATABASE_URL'),
+                        help="Postgres connection string (default: $DATABASE_URL)")
+    p_load.add_argument('--ndjson', metavar='PATH',
+                        help="load from an `import --ndjson` file instead of the JSON files")
+    p_load.add_argument('--snapshot', metavar='PATH',
+                        help="load from a catalog snapshot instead, e.g. a delta written by `diff --output`")
+
+    p_snapshot = sub.add_parser('snapshot', parents=[common],
+                                help="Write the catalog snapshot from the current JSON files (import does this too)")
+    p_snapshot.add_argument('--output', default=SNAPSHOT_PATH, metavar='PATH',
+                            help="snapshot path (default scripts/data/catalog.snapshot; the old one becomes catalog.prev.snapshot)")
+
+    p_stats = sub.add_parser('stats', parents=[common],
+                             help="Write the rating/runtime aggregates from the current JSON files (import does this too)")
+    p_stats.add_argument('--output', default=STATS_PATH, metavar='PATH',
+                         help="where to write them (default scripts/data/catalog_stats.json)")
+    p_stats.add_argument('--database-url', metavar='URL',
+                         help="instead, rebuild the catalog_stats table from the content tables of this database")
+
+    p_diff = sub.add_parser('diff', parents=[common], help="Print rows added or changed between two catalog snapshots")
+    p_diff.add_argument('old', nargs='?', default=PREVIOUS_SNAPSHOT_PATH,
+                        help="older snapshot (default: the one before the last import)")
+    p_diff.add_argument('new', nargs='?', default=SNAPSHOT_PATH, help="newer snapshot (default: the last import)")
+    p_diff.add_argument('--output', metavar='PATH',
+                        help="also write the added/changed rows as a delta snapshot for `load --snapshot`")
+
+    args = parser.parse_args()
+    logging.basicConfig(level=getattr(args, 'log_level', 'INFO'), format="%(message)s", stream=sys.stderr)
+    if args.command == 'search':
+        if args.socket and not args.serve:
+            parser.error("--socket needs --serve")
+        if args.serve and args.live:
+            parser.error("--serve answers from the local index; it cannot be combined with --live")
+        index = None
+        if not args.live and os.path.exists(args.index):
+            index = SearchIndex.load(args.index)
+            data_files = [os.path.join(DATA_DIR, name) for name in ('tv_series_data.json', 'movies_data.json')]
+            if any(os.path.exists(p) and os.path.getmtime(p) > os.path.getmtime(args.index) for p in data_files):
+                log.warning(f"{args.index} is older than the imported data; rebuild it with `index`")
+        elif not args.live:
+            if args.serve:
+                parser.error(f"no search index at {args.index}; build it with `index`")
+            log.info(f"No search index at {args.index} (build it with `index`); searching IMDb online.")
+        if args.serve and args.socket:
+            serve_search_socket(index, args.socket)
+        elif args.serve:
+            serve_search(index, sys.stdin, sys.stdout)
+        else:
+            query = args.query if args.query else input("Enter a title to search on IMDb: ")
+            results = index.search(query, limit=args.limit, kind=args.kind) if index else search_title(query)
             print(json.dumps(results, indent=2))
-        elif sys.argv[1] == 'import':
-            import_star_trek_data()
+    elif args.command == 'index':
+        if args.dataset and not os.path.exists(args.dataset):
+            parser.error(f"--dataset: {args.dataset} does not exist")
+        build_search_index(args.dataset, args.match, args.output)
+    elif args.command in ('import', 'worker'):
+        scheduler.min_interval = args.rate
+        scheduler.burst = max(1, args.burst)
+        fetch_pool(max(1, args.fetch_workers))
+        image_downloader.workers = max(1, args.image_workers)
+        image_downloader.interval = args.image_rate
+        if args.runtimes != TITLE_BASICS_PATH and not os.path.exists(args.runtimes):
+            parser.error(f"--runtimes: {args.runtimes} does not exist")
+        runtime_index.source = args.runtimes
+        response_cache.enabled = not args.no_cache
+        response_cache.offline = args.cache_only
+        if args.command == 'worker':
+            # Responses own stdout; route anything else printed to stderr
+            stream = sys.stdout
+            sys.stdout = sys.stderr
+            log.info(f"imdb_fetch worker ready (pid {os.getpid()})")
+            Worker(sys.stdin, stream, workers=args.workers, index_path=args.index).serve()
+            image_downloader.close()
+            return
+        for imdb_id in args.refresh:
+            response_cache.invalidate(imdb_id)
+        metrics.reset()
+        try:
+            if args.ndjson == '-':
+                # Records own stdout; route anything else printed to stderr
+                stream = sys.stdout
+                sys.stdout = sys.stderr
+                import_star_trek_data(workers=args.workers, incremental=args.incremental, ndjson_stream=stream,
+                                      resume=args.resume, allow_partial=args.allow_partial)
+            elif args.ndjson:
+                os.makedirs(os.path.dirname(os.path.abspath(args.ndjson)), exist_ok=True)
+                with open(args.ndjson, 'w') as stream:
+                    import_star_trek_data(workers=args.workers, incremental=args.incremental, ndjson_stream=stream,
+                                          resume=args.resume, allow_partial=args.allow_partial)
+            else:
+                import_star_trek_data(workers=args.workers, incremental=args.incremental, resume=args.resume,
+                                      allow_partial=args.allow_partial)
+        except CircuitOpenError as e:
+            log.error(f"Import stopped: {e}. Completed titles are in the checkpoint journal; rerun with --resume.")
+            sys.exit(1)
+        except ImportIncompleteError as e:
+            log.error(f"Import incomplete: {e}. The JSON files were not updated; rerun with --resume "
+                      f"to fetch only what is missing, or add --allow-partial to write them without these titles.")
+            sys.exit(1)
+        finally:
+            report = metrics.write_report(args.report)
+            requests = sum(r['count'] for r in report['requests'].values())
+            log.info(f"Run report written to {args.report}: {report['wall_seconds']}s, {requests} IMDb requests, "
+                     f"cache hit rate {report['cache']['hit_rate']}, {report['images']['downloaded']} images downloaded")
+    elif args.command == 'load':
+        if not args.database_url:
+            parser.error("load needs --database-url or DATABASE_URL")
+        load_to_database(args.database_url, ndjson_path=args.ndjson, snapshot_path=args.snapshot)
+    elif args.command == 'snapshot':
+        tv_data, movie_data = load_previous_data()
+        rows = catalog_rows(tv_data, movie_data)
+        if args.output == SNAPSHOT_PATH:
+            write_catalog_snapshot(rows)
+        else:
+            write_snapshot(args.output, rows)
+            log.info(f"Catalog snapshot written to {args.output}")
+    elif args.command == 'stats':
+        if args.database_url:
+            refresh_database_stats(args.database_url)
+        else:
+            tv_data, movie_data = load_previous_data()
+            write_catalog_stats(catalog_rows(tv_data, movie_data), args.output)
+    elif args.command == 'diff':
+        counts = diff_catalog(args.old, args.new, output=args.output, stream=sys.stdout)
+        log.info("Changes: " + ", ".join(f"{table} +{c['added']} ~{c['changed']} -{c['removed']}"
+                                         for table, c in counts.items()))
     else:
-        print("Usage: python imdb_fetch.py [search|import] [query]")
-        print("  search [query]: Search for a title on IMDb")
-        print("  import: Import all Star Trek series and movies data")
+        print("Usage: python imdb_fetch.py [search|index|import|worker|load|snapshot|stats|diff] [query]")
+        print("  search [query] [--limit N] [--kind KIND] [--live] [--serve [--socket PATH]]: Search the local title index (--live: IMDb)")
+        print("  index [--dataset PATH] [--match TEXT] [--output PATH]: Build the local title search index")
+        print("  import [--incremental] [--resume] [--allow-partial] [--ndjson [PATH|-]] [--workers N] [--fetch-workers N] [--image-workers N] [--image-rate SECONDS] [--rate SECONDS] [--burst N]")
+        print("         [--cache-only | --no-cache] [--refresh IMDB_ID ...] [--runtimes PATH] [--report PATH]: Import all Star Trek series and movies data")
+        print("  worker [--workers N] [--index PATH] [import fetch options]: Answer JSON-RPC calls on stdin/stdout, one per line")
+        print("         (methods: ping, search, index, fetch_show, fetch_movie, shutdown)")
+        print("  Every command accepts --log-level DEBUG|INFO|WARNING|ERROR")
+        print("  load [--database-url URL] [--ndjson PATH | --snapshot PATH]: Bulk-load imported data into Postgres")
+        print("  snapshot [--output PATH]: Write the columnar catalog snapshot from the JSON files")
+        print("  stats [--output PATH | --database-url URL]: Write per-show, per-season and per-era rating/runtime aggregates")
+        print("  diff [OLD NEW] [--output PATH]: Print rows added or changed between two snapshots as NDJSON")
 
 if __name__ == '__main__':
     main()
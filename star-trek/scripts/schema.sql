@@ -0,0 +1,120 @@
+-- Database schema, applied by ensureSchema() in import-imdb-data.js and by `imdb_fetch.py load`.
+-- Every statement must be safe to run again on an existing database.
+CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
+
+-- Shows
+CREATE TABLE IF NOT EXISTS shows (
+  id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+  title TEXT UNIQUE NOT NULL,
+  description TEXT,
+  "order" INTEGER,
+  artwork_url TEXT,
+  imdb_rating REAL,
+  runtime INTEGER,
+  created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+  updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+-- Seasons
+CREATE TABLE IF NOT EXISTS seasons (
+  id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+  number INTEGER NOT NULL,
+  show_id UUID NOT NULL REFERENCES shows(id) ON DELETE CASCADE,
+  imdb_rating REAL,
+  artwork_url TEXT,
+  runtime INTEGER,
+  created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+  updated_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+  UNIQUE (show_id, number)
+);
+
+-- Episodes
+CREATE TABLE IF NOT EXISTS episodes (
+  id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+  title TEXT NOT NULL,
+  episode_number INTEGER NOT NULL,
+  season_id UUID NOT NULL REFERENCES seasons(id) ON DELETE CASCADE,
+  air_date TIMESTAMPTZ,
+  artwork_url TEXT,
+  imdb_rating REAL,
+  description TEXT,
+  runtime INTEGER,
+  created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+  updated_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+  UNIQUE (season_id, episode_number)
+);
+
+-- Movies
+CREATE TABLE IF NOT EXISTS movies (
+  id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+  title TEXT UNIQUE NOT NULL,
+  release_date TIMESTAMPTZ,
+  description TEXT,
+  "order" INTEGER,
+  artwork_url TEXT,
+  imdb_rating REAL,
+  runtime INTEGER,
+  created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+  updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+-- Users (kept minimal for auth code refactor later)
+CREATE TABLE IF NOT EXISTS users (
+  id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+  username TEXT UNIQUE NOT NULL,
+  email TEXT UNIQUE NOT NULL,
+  password TEXT NOT NULL,
+  is_admin BOOLEAN NOT NULL DEFAULT false,
+  is_approved BOOLEAN NOT NULL DEFAULT false,
+  created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+  updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+-- Ratings
+CREATE TABLE IF NOT EXISTS ratings (
+  id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+  value REAL NOT NULL,
+  user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+  episode_id UUID REFERENCES episodes(id) ON DELETE CASCADE,
+  movie_id UUID REFERENCES movies(id) ON DELETE CASCADE,
+  season_id UUID REFERENCES seasons(id) ON DELETE CASCADE,
+  show_id UUID REFERENCES shows(id) ON DELETE CASCADE,
+  created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+  updated_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+  UNIQUE (user_id, episode_id),
+  UNIQUE (user_id, movie_id),
+  UNIQUE (user_id, season_id),
+  UNIQUE (user_id, show_id)
+);
+
+-- Notes
+CREATE TABLE IF NOT EXISTS notes (
+  id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+  content TEXT NOT NULL,
+  user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+  episode_id UUID REFERENCES episodes(id) ON DELETE CASCADE,
+  movie_id UUID REFERENCES movies(id) ON DELETE CASCADE,
+  season_id UUID REFERENCES seasons(id) ON DELETE CASCADE,
+  show_id UUID REFERENCES shows(id) ON DELETE CASCADE,
+  created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+  updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+-- Watch progress (global, not per-user to match prior schema)
+CREATE TABLE IF NOT EXISTS watch_progress (
+  id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+  watched BOOLEAN NOT NULL DEFAULT false,
+  episode_id UUID UNIQUE REFERENCES episodes(id) ON DELETE CASCADE,
+  movie_id UUID UNIQUE REFERENCES movies(id) ON DELETE CASCADE,
+  season_id UUID UNIQUE REFERENCES seasons(id) ON DELETE CASCADE,
+  show_id UUID UNIQUE REFERENCES shows(id) ON DELETE CASCADE,
+  created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+  updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+-- Precomputed IMDb rating/runtime aggregates (written by imdb_fetch.py import/load)
+CREATE TABLE IF NOT EXISTS catalog_stats (
+  scope TEXT PRIMARY KEY,
+  stats JSONB NOT NULL,
+  updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
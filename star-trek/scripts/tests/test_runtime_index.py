@@ -0,0 +1,61 @@
+"""
+Tests for RuntimeIndex, the bulk runtime lookup built from IMDb's title.basics dataset.
+No network or database needed.
+
+    python -m pytest scripts/tests
+"""
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import imdb_fetch
+
+HEADER = 'tconst\ttitleType\tprimaryTitle\truntimeMinutes\tgenres\n'
+
+
+class RuntimeIndexTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.source = os.path.join(tmp.name, 'title.basics.tsv')
+        self.index_path = os.path.join(tmp.name, 'title_runtimes.bin')
+
+    def write_source(self, rows, mtime=None):
+        with open(self.source, 'w') as f:
+            f.write(HEADER + ''.join('\t'.join(row) + '\n' for row in rows))
+        if mtime is not None:
+            os.utime(self.source, (mtime, mtime))
+
+    def index(self):
+        return imdb_fetch.RuntimeIndex(self.source, self.index_path)
+
+    def test_lookups(self):
+        self.write_source([('tt0708414', 'tvEpisode', 'Encounter at Farpoint', '92', 'Sci-Fi'),
+                           ('tt0060028', 'tvSeries', 'Star Trek', '50', 'Sci-Fi'),
+                           ('tt0084726', 'movie', 'The Wrath of Khan', '\\N', 'Sci-Fi')])
+        index = self.index()
+        self.assertEqual(index.lookup('tt0060028'), 50)
+        self.assertEqual(index.lookup_many(['tt0708414', 'tt0084726', 'nm0000001']), {'tt0708414': 92})
+
+    def test_index_is_rebuilt_when_the_dataset_changes(self):
+        self.write_source([('tt0060028', 'tvSeries', 'Star Trek', '50', 'Sci-Fi')], mtime=1_600_000_000)
+        self.assertEqual(self.index().lookup('tt0060028'), 50)
+        # A different dataset with an older mtime than the index (e.g. restored from a backup)
+        self.write_source([('tt0060028', 'tvSeries', 'Star Trek', '51', 'Sci-Fi'),
+                           ('tt0092455', 'tvSeries', 'Star Trek: The Next Generation', '44', 'Sci-Fi')],
+                          mtime=1_500_000_000)
+        index = self.index()
+        self.assertEqual((index.lookup('tt0060028'), index.lookup('tt0092455')), (51, 44))
+
+    def test_unchanged_dataset_reuses_the_index(self):
+        self.write_source([('tt0060028', 'tvSeries', 'Star Trek', '50', 'Sci-Fi')])
+        self.index().load()
+        built = os.stat(self.index_path).st_mtime_ns
+        self.index().load()
+        self.assertEqual(os.stat(self.index_path).st_mtime_ns, built)
+
+
+if __name__ == '__main__':
+    unittest.main()
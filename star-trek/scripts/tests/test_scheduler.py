@@ -0,0 +1,209 @@
+"""
+Tests for RequestScheduler (token bucket, backoff, circuit breaker, in-flight dedup), on a fake
+clock: sleeping advances the clock instead of waiting, so every delay is checked exactly.
+
+    python -m pytest scripts/tests
+"""
+import os
+import sys
+import threading
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import imdb_fetch
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class MaxJitter:
+    """Stands in for the scheduler's random.Random: full jitter always picks the upper bound."""
+    def uniform(self, low, high):
+        return high
+
+
+class HTTPFailure(Exception):
+    def __init__(self, code, retry_after=None):
+        super().__init__(f"HTTP {code}")
+        self.code = code
+        self.headers = {'Retry-After': str(retry_after)} if retry_after is not None else {}
+
+
+def scheduler(clock, **kwargs):
+    s = imdb_fetch.RequestScheduler(clock=clock, sleep=clock.sleep, **kwargs)
+    s._random = MaxJitter()
+    return s
+
+
+def failing(*errors):
+    """fn for call(): raises the given errors in turn, then returns 'page'."""
+    errors = list(errors)
+    calls = []
+    def fn():
+        calls.append(1)
+        if errors:
+            raise errors.pop(0)
+        return 'page'
+    return fn, calls
+
+
+class TokenBucketTest(unittest.TestCase):
+    def test_burst_then_interval(self):
+        clock = FakeClock()
+        s = scheduler(clock, min_interval=1.0, burst=2)
+        for _ in range(4):
+            s.wait('imdb')
+        self.assertEqual(clock.sleeps, [1.0, 1.0])
+
+    def test_tokens_refill_up_to_burst(self):
+        clock = FakeClock()
+        s = scheduler(clock, min_interval=1.0, burst=2)
+        s.wait('imdb')
+        s.wait('imdb')
+        clock.now += 60
+        for _ in range(3):
+            s.wait('imdb')
+        self.assertEqual(clock.sleeps, [1.0])
+
+    def test_hosts_are_independent_and_interval_overrides(self):
+        clock = FakeClock()
+        s = scheduler(clock, min_interval=1.0, burst=1)
+        s.wait('imdb')
+        s.wait('images', interval=0.25)
+        s.wait('images', interval=0.25)
+        self.assertEqual(clock.sleeps, [0.25])
+
+    def test_throttling_doubles_the_interval_and_success_eases_it(self):
+        clock = FakeClock()
+        s = scheduler(clock, min_interval=1.0)
+        s.record('imdb', ok=False, status=429)
+        s.record('imdb', ok=False, status=503)
+        self.assertEqual(s._hosts['imdb']['interval'], 4.0)
+        s.record('imdb', ok=True)
+        self.assertAlmostEqual(s._hosts['imdb']['interval'], 3.6)
+        for _ in range(100):
+            s.record('imdb', ok=True)
+        self.assertEqual(s._hosts['imdb']['interval'], 1.0)
+
+
+class BackoffTest(unittest.TestCase):
+    def test_exponential_backoff_then_success(self):
+        clock = FakeClock()
+        fn, calls = failing(HTTPFailure(503), HTTPFailure(500), ConnectionError("reset"))
+        self.assertEqual(scheduler(clock).call('imdb', 'k', fn), 'page')
+        self.assertEqual(len(calls), 4)
+        self.assertEqual(clock.sleeps, [1.0, 2.0, 4.0])
+
+    def test_gives_up_after_the_retries(self):
+        clock = FakeClock()
+        fn, calls = failing(*[HTTPFailure(503)] * 10)
+        with self.assertRaises(HTTPFailure):
+            scheduler(clock, retries=2).call('imdb', 'k', fn)
+        self.assertEqual(len(calls), 3)
+        self.assertEqual(clock.sleeps, [1.0, 2.0])
+
+    def test_client_errors_are_not_retried(self):
+        clock = FakeClock()
+        fn, calls = failing(HTTPFailure(404))
+        with self.assertRaises(HTTPFailure):
+            scheduler(clock).call('imdb', 'k', fn)
+        self.assertEqual((len(calls), clock.sleeps), (1, []))
+
+    def test_retry_after_is_honoured_up_to_the_backoff_cap(self):
+        clock = FakeClock()
+        fn, _ = failing(HTTPFailure(429, retry_after=5), HTTPFailure(429, retry_after=3600))
+        scheduler(clock).call('imdb', 'k', fn)
+        self.assertEqual(clock.sleeps, [5.0, imdb_fetch.REQUEST_BACKOFF_MAX])
+
+
+class CircuitBreakerTest(unittest.TestCase):
+    def trip(self, s, host='imdb'):
+        for _ in range(imdb_fetch.CIRCUIT_WINDOW):
+            s.record(host, ok=False)
+
+    def test_failures_pause_the_host_with_doubling_cooldowns(self):
+        clock = FakeClock()
+        s = scheduler(clock)
+        for _ in range(3):
+            self.trip(s)
+            s.wait('imdb')
+        cooldown = imdb_fetch.CIRCUIT_COOLDOWN
+        self.assertEqual(clock.sleeps, [cooldown, cooldown * 2, cooldown * 4])
+
+    def test_a_healthy_window_closes_the_circuit(self):
+        clock = FakeClock()
+        s = scheduler(clock)
+        self.trip(s)
+        s.wait('imdb')
+        for _ in range(imdb_fetch.CIRCUIT_WINDOW):
+            s.record('imdb', ok=True)
+        self.assertEqual(s._hosts['imdb']['trips'], 0)
+
+    def test_gives_up_then_half_opens(self):
+        clock = FakeClock()
+        s = scheduler(clock)
+        for _ in range(imdb_fetch.CIRCUIT_MAX_TRIPS):
+            self.trip(s)
+            s.wait('imdb')
+        self.trip(s)
+        with self.assertRaises(imdb_fetch.CircuitOpenError):
+            s.wait('imdb')
+        s.wait('other')  # other hosts are unaffected
+        clock.now += imdb_fetch.CIRCUIT_GIVE_UP
+        s.wait('imdb')
+        self.assertEqual(s._hosts['imdb']['trips'], imdb_fetch.CIRCUIT_MAX_TRIPS)
+        self.trip(s)  # one more trip gives up again
+        with self.assertRaises(imdb_fetch.CircuitOpenError):
+            s.wait('imdb')
+
+    def test_outcomes_while_paused_are_ignored(self):
+        clock = FakeClock()
+        s = scheduler(clock)
+        self.trip(s)
+        self.trip(s)  # requests that were in flight when the circuit opened
+        self.assertEqual(s._hosts['imdb']['trips'], 1)
+
+
+class InFlightDedupTest(unittest.TestCase):
+    def test_identical_concurrent_calls_share_one_request(self):
+        s = imdb_fetch.RequestScheduler()
+        started, release = threading.Event(), threading.Event()
+        calls = []
+
+        def fn():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return 'page'
+
+        results = []
+        first = threading.Thread(target=lambda: results.append(s.call('imdb', 'k', fn)))
+        first.start()
+        started.wait(5)
+        deduplicated = imdb_fetch.metrics.counters.get('scheduler.deduplicated', 0)
+        second = threading.Thread(target=lambda: results.append(s.call('imdb', 'k', fn)))
+        second.start()
+        while imdb_fetch.metrics.counters.get('scheduler.deduplicated', 0) == deduplicated and second.is_alive():
+            second.join(0.01)
+        release.set()
+        first.join(5)
+        second.join(5)
+        self.assertEqual((results, len(calls)), (['page', 'page'], 1))
+        self.assertEqual(s._in_flight, {})
+        # Once finished, the same key is requested again
+        self.assertEqual(s.call('imdb', 'k', fn), 'page')
+        self.assertEqual(len(calls), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
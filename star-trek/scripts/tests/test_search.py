@@ -0,0 +1,110 @@
+"""
+Tests for the local title search (SearchIndex, `search --serve`). No network or database needed.
+
+    python -m pytest scripts/tests
+"""
+import io
+import os
+import sys
+import json
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import imdb_fetch
+
+ENTRIES = [
+    {'title': 'Star Trek: The Next Generation', 'year': 1987, 'kind': 'tv series', 'imdbId': 'tt0092455',
+     'aliases': ['TNG']},
+    {'title': 'Star Trek II: The Wrath of Khan', 'year': 1982, 'kind': 'movie', 'imdbId': 'tt0084726', 'aliases': []},
+]
+
+CATALOG = [
+    {'title': 'Star Trek', 'year': 1966, 'kind': 'tv series', 'imdbId': 'tt0060028',
+     'aliases': ['Star Trek: The Original Series', 'TOS']},
+    {'title': 'Star Trek: Picard', 'year': 2020, 'kind': 'tv series', 'imdbId': 'tt8806524', 'aliases': []},
+    {'title': 'Star Trek Beyond', 'year': 2016, 'kind': 'movie', 'imdbId': 'tt2660888', 'aliases': []},
+    {'title': 'Star Trek: Enterprise', 'year': 2001, 'kind': 'tv series', 'imdbId': 'tt0244365',
+     'aliases': ['Enterprise', 'ENT']},
+    {'title': 'Enterprise', 'year': 1968, 'kind': 'episode', 'imdbId': 'tt0708424', 'show': 'Star Trek',
+     'season': 3, 'episode': 2},
+    {'title': 'Star Trek II: The Wrath of Khan', 'year': 1982, 'kind': 'movie', 'imdbId': 'tt0084726', 'aliases': []},
+]
+
+
+def titles(results):
+    return [r['title'] for r in results]
+
+
+class SearchIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.index = imdb_fetch.SearchIndex.build(CATALOG)
+
+    def test_exact_then_prefix_then_shorter_then_older(self):
+        results = self.index.search('star trek')
+        self.assertEqual(titles(results), ['Star Trek', 'Star Trek Beyond', 'Star Trek: Picard',
+                                           'Star Trek: Enterprise', 'Star Trek II: The Wrath of Khan'])
+        self.assertEqual([r['score'] for r in results[:2]], [3.0, 2.0])
+
+    def test_word_match_and_aliases(self):
+        self.assertEqual(titles(self.index.search('picard')), ['Star Trek: Picard'])
+        self.assertEqual(titles(self.index.search('TOS')), ['Star Trek'])
+
+    def test_titles_rank_above_episodes_with_the_same_score(self):
+        results = self.index.search('enterprise')
+        self.assertEqual([r['kind'] for r in results], ['tv series', 'episode'])
+        self.assertEqual(results[0]['score'], results[1]['score'])
+
+    def test_misspellings_still_match(self):
+        result, = self.index.search('wrath of kahn')
+        self.assertEqual(result['imdbId'], 'tt0084726')
+        self.assertLess(result['score'], 1)
+
+    def test_weak_matches_are_dropped(self):
+        self.assertEqual(self.index.search('voyager'), [])
+        self.assertEqual(self.index.search('   '), [])
+
+    def test_kind_filter_and_limit(self):
+        self.assertEqual(titles(self.index.search('star trek', kind='movie')),
+                         ['Star Trek Beyond', 'Star Trek II: The Wrath of Khan'])
+        self.assertEqual(titles(self.index.search('star trek', limit=2)), ['Star Trek', 'Star Trek Beyond'])
+
+    def test_duplicates_merge_by_imdb_id(self):
+        index = imdb_fetch.SearchIndex.build(CATALOG + [
+            {'title': 'Star Trek: TOS', 'year': 1966, 'kind': 'tv series', 'imdbId': 'tt0060028'}])
+        self.assertEqual(len(index.entries), len(CATALOG))
+        result = index.search('star trek tos')[0]
+        self.assertEqual((result['title'], result['score']), ('Star Trek', 3.0))
+
+    def test_saved_index_answers_the_same(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'search_index.json')
+            self.index.save(path)
+            loaded = imdb_fetch.SearchIndex.load(path)
+        for query in ('star trek', 'enterprise', 'wrath of kahn'):
+            self.assertEqual(loaded.search(query), self.index.search(query))
+
+
+class ServeSearchTest(unittest.TestCase):
+    def serve(self, *lines):
+        out = io.StringIO()
+        imdb_fetch.serve_search(imdb_fetch.SearchIndex.build(ENTRIES), io.StringIO(''.join(l + '\n' for l in lines)), out)
+        return [json.loads(line) for line in out.getvalue().splitlines()]
+
+    def test_bad_requests_answer_an_error_and_the_server_keeps_going(self):
+        answers = self.serve('{"query": "tng", "limit": "x"}', '{"query": "tng", "limit": -1}',
+                             '{"query": "tng", "limit": true}', '{"query": ',
+                             '{"query": "tng", "limit": 1}')
+        self.assertEqual(len(answers), 5)
+        for answer in answers[:4]:
+            self.assertIn('error', answer)
+        self.assertEqual([r['imdbId'] for r in answers[4]['results']], ['tt0092455'])
+
+    def test_plain_query_line(self):
+        answer, = self.serve('wrath of khan')
+        self.assertEqual(answer['query'], 'wrath of khan')
+        self.assertEqual(answer['results'][0]['imdbId'], 'tt0084726')
+
+
+if __name__ == '__main__':
+    unittest.main()
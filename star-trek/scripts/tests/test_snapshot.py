@@ -0,0 +1,101 @@
+"""
+Tests for the columnar catalog snapshot (`snapshot`, `diff`, `load --snapshot`). No network or
+database needed.
+
+    python -m pytest scripts/tests
+"""
+import io
+import os
+import sys
+import json
+import copy
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import imdb_fetch
+
+TV_DATA = [{
+    'show': {'imdbId': 'tt0060028', 'title': 'Star Trek: The Original Series', 'description': 'The five-year mission.',
+             'order': 1, 'artworkUrl': None, 'imdbRating': 8.4, 'runtime': 150},
+    'seasons': [{'number': 1, 'imdbRating': 7.75, 'runtime': 100, 'episodes': [
+        {'title': 'The Man Trap', 'episodeNumber': '1', 'airDate': '1966-09-08', 'artworkUrl': None,
+         'imdbRating': 7.3, 'description': 'Salt vampire.', 'runtime': 50},
+        {'title': 'Charlie X', 'episodeNumber': '2', 'airDate': '1966-09-15', 'artworkUrl': '/images/charlie.jpg',
+         'imdbRating': None, 'description': 'Café — “Thasians”', 'runtime': 50},
+    ]}],
+}]
+MOVIE_DATA = [
+    {'title': 'Star Trek: The Motion Picture', 'releaseDate': '1979-12-07', 'description': 'V\'Ger.', 'order': 1,
+     'artworkUrl': None, 'imdbRating': 6.4, 'runtime': 132},
+    {'title': 'Star Trek II: The Wrath of Khan', 'releaseDate': '1982-06-04', 'description': None, 'order': 2,
+     'artworkUrl': None, 'imdbRating': 7.7, 'runtime': 113},
+]
+
+
+class SnapshotTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = tmp.name
+
+    def write(self, name, tv_data, movie_data):
+        path = os.path.join(self.dir, name)
+        imdb_fetch.write_snapshot(path, imdb_fetch.catalog_rows(tv_data, movie_data))
+        return path
+
+    def test_round_trip(self):
+        rows = imdb_fetch.catalog_rows(TV_DATA, MOVIE_DATA)
+        header, tables = imdb_fetch.read_snapshot(self.write('catalog.snapshot', TV_DATA, MOVIE_DATA))
+        self.assertFalse(header['delta'])
+        self.assertEqual(tables['episodes']['rows'], 2)
+        self.assertEqual(imdb_fetch.snapshot_rows(tables), rows)
+
+    def test_not_a_snapshot(self):
+        path = os.path.join(self.dir, 'catalog.snapshot')
+        with open(path, 'wb') as f:
+            f.write(b'{"tables": {}}')
+        with self.assertRaises(ValueError):
+            imdb_fetch.read_snapshot(path)
+
+    def test_diff(self):
+        old = self.write('old.snapshot', TV_DATA, MOVIE_DATA)
+        tv_data, movie_data = copy.deepcopy(TV_DATA), copy.deepcopy(MOVIE_DATA[:1])
+        episodes = tv_data[0]['seasons'][0]['episodes']
+        episodes[1]['imdbRating'] = 6.9
+        episodes.append({'title': 'Where No Man Has Gone Before', 'episodeNumber': '3', 'airDate': '1966-09-22',
+                         'imdbRating': 8.0, 'runtime': 50})
+        new = self.write('new.snapshot', tv_data, movie_data)
+        out = io.StringIO()
+        delta_path = os.path.join(self.dir, 'delta.snapshot')
+
+        counts = imdb_fetch.diff_catalog(old, new, output=delta_path, stream=out)
+
+        self.assertEqual(counts, {
+            'shows': {'added': 0, 'changed': 0, 'removed': 0},
+            'seasons': {'added': 0, 'changed': 0, 'removed': 0},
+            'episodes': {'added': 1, 'changed': 1, 'removed': 0},
+            'movies': {'added': 0, 'changed': 0, 'removed': 1},
+        })
+        records = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual([(r['table'], r['change'], r['row']['title']) for r in records],
+                         [('episodes', 'changed', 'Charlie X'), ('episodes', 'added', 'Where No Man Has Gone Before')])
+        self.assertEqual(records[0]['columns'], ['imdb_rating'])
+        self.assertEqual(records[0]['row']['imdb_rating'], 6.9)
+        header, tables = imdb_fetch.read_snapshot(delta_path)
+        self.assertTrue(header['delta'])
+        delta = imdb_fetch.snapshot_rows(tables)
+        self.assertEqual([row[2] for row in delta['episodes']], ['Charlie X', 'Where No Man Has Gone Before'])
+        self.assertEqual(delta['shows'] + delta['seasons'] + delta['movies'], [])
+
+    def test_identical_snapshots_have_no_changes(self):
+        old = self.write('old.snapshot', TV_DATA, MOVIE_DATA)
+        new = self.write('new.snapshot', TV_DATA, MOVIE_DATA)
+        out = io.StringIO()
+        counts = imdb_fetch.diff_catalog(old, new, stream=out)
+        self.assertEqual(out.getvalue(), '')
+        self.assertTrue(all(c == {'added': 0, 'changed': 0, 'removed': 0} for c in counts.values()))
+
+
+if __name__ == '__main__':
+    unittest.main()